@@ -0,0 +1,65 @@
+import hmac
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from core.config import settings
+from models.schemas import CompleteJobRequest, EnqueueRequest, FailJobRequest, JobSchema
+from services.job_queue import SQLiteJobQueue, get_job_queue
+
+
+def require_queue_token(x_queue_token: Optional[str] = Header(None)):
+    # Workers on other nodes call these endpoints; settings.QUEUE_TOKEN gates them
+    if settings.QUEUE_TOKEN and not hmac.compare_digest(x_queue_token or "", settings.QUEUE_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid queue token")
+
+
+router = APIRouter(dependencies=[Depends(require_queue_token)])
+
+@router.post("/jobs")
+def enqueue(payload: EnqueueRequest, queue: SQLiteJobQueue = Depends(get_job_queue)):
+    return {"ids": queue.enqueue_many(payload.urls)}
+
+
+@router.post("/workers/{worker_id}/heartbeat")
+def heartbeat(worker_id: str, queue: SQLiteJobQueue = Depends(get_job_queue)):
+    queue.heartbeat(worker_id)
+    return {"ok": True}
+
+
+@router.delete("/workers/{worker_id}")
+def unregister(worker_id: str, queue: SQLiteJobQueue = Depends(get_job_queue)):
+    queue.unregister(worker_id)
+    return {"ok": True}
+
+
+@router.post("/workers/{worker_id}/claim", response_model=Optional[JobSchema])
+def claim(worker_id: str, queue: SQLiteJobQueue = Depends(get_job_queue)):
+    job = queue.claim(worker_id)
+    return asdict(job) if job else None
+
+
+@router.post("/jobs/{job_id}/complete")
+def complete(job_id: int, payload: CompleteJobRequest, queue: SQLiteJobQueue = Depends(get_job_queue)):
+    # ok is False when the job was reassigned after the worker was presumed dead
+    return {"ok": queue.complete(job_id, payload.worker_id, payload.result)}
+
+
+@router.post("/jobs/{job_id}/fail")
+def fail(job_id: int, payload: FailJobRequest, queue: SQLiteJobQueue = Depends(get_job_queue)):
+    return {"ok": queue.fail(job_id, payload.worker_id, payload.error)}
+
+
+@router.post("/reap")
+def reap(queue: SQLiteJobQueue = Depends(get_job_queue)):
+    return {"reaped": queue.reap_dead_workers()}
+
+
+@router.get("/counts")
+def counts(queue: SQLiteJobQueue = Depends(get_job_queue)) -> Dict[str, int]:
+    return queue.counts()
+
+
+@router.get("/jobs/{job_id}/result")
+def result(job_id: int, queue: SQLiteJobQueue = Depends(get_job_queue)) -> Optional[Dict[str, Any]]:
+    return queue.result(job_id)
@@ -1,18 +1,42 @@
-from fastapi import APIRouter, HTTPException
-from models.schemas import ExtractRequest, BrandInsightsSchema
-from services.insights_service import ShopifyInsightsService
+from typing import Optional
+
+import httpx
+from fastapi import APIRouter, HTTPException, Query
+from models.schemas import ExtractRequest, BrandInsightsSchema, ProductSearchResponseSchema
+from services.extraction import extract_store
+from services.search_index import get_search_index
 
 router = APIRouter()
 
 @router.post("/extract", response_model=BrandInsightsSchema)
 def extract(payload: ExtractRequest):
     try:
-        result = ShopifyInsightsService.fetch_brand_insights(payload.website_url)
-        if "error" in result:
-            # Return HTTP 400 with error message
-            raise HTTPException(status_code=400, detail=result["error"])
-        return result
+        # Also updates the product search index
+        return extract_store(payload.website_url)
+    except httpx.HTTPError as e:
+        # Store unreachable or returned an error status
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Catch unexpected errors
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.get("/search", response_model=ProductSearchResponseSchema)
+def search(
+    q: str = Query(..., min_length=1, description="Search text (title, description, handle)"),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    brand: Optional[str] = Query(None, description="Restrict to one store domain"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=400, detail="min_price cannot exceed max_price")
+    try:
+        results = get_search_index().search(
+            q, min_price=min_price, max_price=max_price, domain=brand,
+            limit=limit, offset=offset
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"query": q, "count": len(results), "results": results}
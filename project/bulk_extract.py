@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Bulk in-process extractor.
+
+Reads a list of store URLs and runs the scraper directly (no HTTP API)
+with bounded async concurrency, streaming results to NDJSON or Parquet.
+Progress is checkpointed so a crashed run resumes where it stopped.
+
+    python bulk_extract.py urls.txt -o out.ndjson
+    python bulk_extract.py urls.txt -o out_dir --format parquet --concurrency 16
+
+Input may be one URL per line, JSON lines like test.json
+({"website_url": ...}), or a JSON array of either. Failed stores are not
+checkpointed, so every resume or rerun retries them; the failures of the
+latest run are listed in <output>.errors.ndjson.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from services.extraction import extract_store
+
+logger = logging.getLogger("bulk_extract")
+
+PRODUCT_FIELDS = ["id", "title", "handle", "description", "price", "images", "product_url"]
+
+
+# -----------------------------
+# Input
+# -----------------------------
+def _url_of(item: Any) -> Optional[str]:
+    if isinstance(item, dict):
+        item = item.get("website_url")
+    return item.strip() if isinstance(item, str) and item.strip() else None
+
+
+def read_urls(path: Path) -> List[str]:
+    text = path.read_text(encoding="utf-8-sig").strip()
+    if text.startswith("["):
+        items: Iterable[Any] = json.loads(text)
+    else:
+        items = (
+            json.loads(line) if line.lstrip().startswith("{") else line
+            for line in text.splitlines()
+        )
+    seen: Set[str] = set()
+    urls = []
+    for item in items:
+        url = _url_of(item)
+        if url and url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def to_columns(rows: List[Dict[str, Any]], fields: List[str]) -> Dict[str, List[Any]]:
+    """Row dicts -> {field: [values...]}."""
+    return {f: [r.get(f) for r in rows] for f in fields}
+
+
+def _split_catalog(result: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Return (result without catalog, catalog rows)."""
+    if "data" not in result:
+        return dict(result), []
+    data = dict(result.get("data") or {})
+    products = dict(data.get("products") or {})
+    catalog = products.pop("catalog", None) or []
+    if products:
+        data["products"] = products
+    return {**result, "data": data}, catalog
+
+
+# -----------------------------
+# Checkpoint
+# -----------------------------
+class Checkpoint:
+    """
+    Append-only log of finished URLs. Each entry also stores the sink state
+    (byte offset / part number) that was durable when the URL was recorded,
+    so resuming can discard output written after the last checkpoint.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> Tuple[Set[str], Optional[int]]:
+        """
+        Return (finished URLs, last sink state). A torn trailing entry from a
+        crash is cut off so that later entries append after the last valid one.
+        """
+        done: Set[str] = set()
+        state: Optional[int] = None
+        if not self.path.exists():
+            return done, state
+        valid_end = 0
+        with self.path.open("r+b") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated entry")
+                    entry = json.loads(line)
+                    urls, entry_state = entry["urls"], entry["state"]
+                except (ValueError, KeyError, TypeError):
+                    break  # torn final write from a crash
+                done.update(urls)
+                state = entry_state
+                valid_end += len(line)
+            f.truncate(valid_end)
+        return done, state
+
+    def record(self, urls: List[str], state: int) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"urls": urls, "state": state}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+
+
+# -----------------------------
+# Sinks
+# -----------------------------
+class NDJSONSink:
+    """One JSON object per store; its catalog is stored column-wise under data.products.catalog."""
+
+    def __init__(self, path: Path, resume_state: Optional[int]):
+        self.path = path
+        if resume_state is None:
+            self._f = path.open("wb")
+        else:
+            size = path.stat().st_size if path.exists() else None
+            if size is None or size < resume_state:
+                # Truncating up to the offset would pad the file with NUL bytes
+                found = "missing" if size is None else f"only {size} bytes"
+                raise SystemExit(
+                    f"{path} is {found} but its checkpoint expects {resume_state} bytes;"
+                    " rerun with --restart to start over"
+                )
+            self._f = path.open("r+b")
+            self._f.truncate(resume_state)
+            self._f.seek(resume_state)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        rest, catalog = _split_catalog(record)
+        if "data" in record:
+            rest["data"].setdefault("products", {})["catalog"] = to_columns(catalog, PRODUCT_FIELDS)
+        self._f.write((json.dumps(rest, default=str) + "\n").encode("utf-8"))
+
+    def commit(self) -> int:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ParquetSink:
+    """
+    Writes <dir>/stores/part-N.parquet (one row per store, non-catalog data as JSON)
+    and <dir>/products/part-N.parquet (one row per product) on every commit.
+    """
+
+    def __init__(self, path: Path, resume_state: Optional[int]):
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+        self.path = path
+        self.part = resume_state or 0
+        for sub in ("stores", "products"):
+            (path / sub).mkdir(parents=True, exist_ok=True)
+            # Drop parts written after the last checkpoint
+            for f in (path / sub).glob("part-*.parquet"):
+                if int(f.stem.split("-")[1]) > self.part:
+                    f.unlink()
+        self._stores: List[Dict[str, Any]] = []
+        self._products: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        rest, catalog = _split_catalog(record)
+        url = record.get("website_url")
+        self._stores.append({
+            "website_url": url,
+            "status": rest.get("status"),
+            "brand_name": rest.get("brand_name"),
+            "extraction_timestamp": rest.get("extraction_timestamp"),
+            "processing_time_seconds": rest.get("processing_time_seconds"),
+            "data_json": json.dumps(rest.get("data"), default=str) if "data" in rest else None,
+        })
+        for p in catalog:
+            try:
+                price = float(p["price"]) if p.get("price") not in (None, "") else None
+            except (TypeError, ValueError):
+                price = None
+            self._products.append({
+                "website_url": url,
+                "id": str(p["id"]) if p.get("id") is not None else None,
+                "title": p.get("title"),
+                "handle": p.get("handle"),
+                "description": p.get("description"),
+                "price": price,
+                "images": p.get("images") or [],
+                "product_url": p.get("product_url"),
+            })
+
+    def commit(self) -> int:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._stores:
+            return self.part
+        # Fixed schemas keep every part readable as one dataset
+        store_schema = pa.schema([
+            ("website_url", pa.string()), ("status", pa.string()), ("brand_name", pa.string()),
+            ("extraction_timestamp", pa.string()),
+            ("processing_time_seconds", pa.float64()), ("data_json", pa.string()),
+        ])
+        product_schema = pa.schema([
+            ("website_url", pa.string()), ("id", pa.string()), ("title", pa.string()),
+            ("handle", pa.string()), ("description", pa.string()), ("price", pa.float64()),
+            ("images", pa.list_(pa.string())), ("product_url", pa.string()),
+        ])
+        self.part += 1
+        name = f"part-{self.part:05d}.parquet"
+        pq.write_table(pa.Table.from_pylist(self._stores, schema=store_schema), self.path / "stores" / name)
+        if self._products:
+            pq.write_table(
+                pa.Table.from_pylist(self._products, schema=product_schema),
+                self.path / "products" / name
+            )
+        self._stores, self._products = [], []
+        return self.part
+
+    def close(self) -> None:
+        pass
+
+
+SINKS = {"ndjson": NDJSONSink, "parquet": ParquetSink}
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+async def run(
+    urls: List[str],
+    sink,
+    checkpoint: Checkpoint,
+    concurrency: int,
+    commit_every: int,
+    errors: IO[str],
+) -> Dict[str, int]:
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    pending = iter(urls)
+
+    async def worker() -> None:
+        # Workers share one iterator; safe since asyncio is single-threaded
+        for url in pending:
+            try:
+                record = await loop.run_in_executor(executor, extract_store, url)
+            except Exception as e:
+                record = {"website_url": url, "status": "error", "error": str(e)}
+            await results.put((url, record))
+
+    async def producers() -> None:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        await results.put(None)
+
+    stats = {"success": 0, "error": 0}
+    uncommitted: List[str] = []
+    producer = asyncio.create_task(producers())
+    try:
+        while True:
+            item = await results.get()
+            if item is None:
+                break
+            url, record = item
+            if record.get("status") == "success":
+                sink.write(record)
+                uncommitted.append(url)
+                stats["success"] += 1
+            else:
+                # Kept out of the output and the checkpoint so a resume retries it
+                errors.write(json.dumps(record, default=str) + "\n")
+                errors.flush()
+                stats["error"] += 1
+            if len(uncommitted) >= commit_every:
+                checkpoint.record(uncommitted, sink.commit())
+                uncommitted = []
+            done = stats["success"] + stats["error"]
+            if done % 50 == 0:
+                logger.info(f"{done}/{len(urls)} stores processed")
+        if uncommitted:
+            checkpoint.record(uncommitted, sink.commit())
+        await producer
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk Shopify store extraction")
+    parser.add_argument("input", type=Path, help="URL list (plain lines, JSON lines or JSON array)")
+    parser.add_argument("-o", "--output", type=Path, required=True,
+                        help="NDJSON file, or directory for parquet")
+    parser.add_argument("--format", choices=sorted(SINKS), default="ndjson")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--commit-every", type=int, default=None,
+                        help="Stores per checkpoint (default: 1 for ndjson, 100 for parquet)")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore any checkpoint and start from scratch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    checkpoint = Checkpoint(Path(str(args.output).rstrip("/") + ".checkpoint"))
+    errors_path = Path(str(args.output).rstrip("/") + ".errors.ndjson")
+    if args.restart:
+        checkpoint.remove()
+        if args.output.is_dir():
+            shutil.rmtree(args.output)
+        elif args.output.exists():
+            args.output.unlink()
+
+    done, state = checkpoint.load()
+    urls = [u for u in read_urls(args.input) if u not in done]
+    if done:
+        logger.info(f"Resuming: {len(done)} stores already done, {len(urls)} remaining")
+
+    commit_every = args.commit_every or (1 if args.format == "ndjson" else 100)
+    sink = SINKS[args.format](args.output, state)
+    try:
+        with errors_path.open("w", encoding="utf-8") as errors:
+            stats = asyncio.run(run(urls, sink, checkpoint, args.concurrency, commit_every, errors))
+    finally:
+        sink.close()
+    logger.info(f"Finished: {stats['success']} succeeded, {stats['error']} failed")
+    if stats["error"]:
+        logger.info(f"Failures listed in {errors_path}; rerun to retry them")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
+# Local state (caches, indexes) lives next to the code, not in the CWD
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
 
 class Settings(BaseSettings):
     # API Configuration
@@ -17,6 +21,27 @@ class Settings(BaseSettings):
     
     # Rate limiting
     RATE_LIMIT_DELAY: float = 1.0
+
+    # Recrawl scheduler
+    RECRAWL_MIN_INTERVAL_SECONDS: int = 3600
+    RECRAWL_MAX_INTERVAL_SECONDS: int = 7 * 24 * 3600
+    RECRAWL_DEFAULT_INTERVAL_SECONDS: int = 24 * 3600
+    RECRAWL_MAX_WORKERS: int = 4
+    RECRAWL_REQUESTS_PER_HOUR: int = 2000
+    RECRAWL_POLL_SECONDS: float = 60.0
+
+    # Product search index (SQLite FTS5)
+    SEARCH_INDEX_PATH: str = str(PROJECT_DIR / ".cache" / "search_index.sqlite3")
+
+    # Distributed extraction (services/job_queue.py, services/extraction_worker.py)
+    QUEUE_PATH: str = str(PROJECT_DIR / ".cache" / "jobs.sqlite3")
+    QUEUE_NUM_SHARDS: int = 64
+    WORKER_HEARTBEAT_SECONDS: float = 10.0
+    WORKER_DEAD_AFTER_SECONDS: float = 60.0
+    WORKER_POLL_SECONDS: float = 2.0
+    JOB_MAX_ATTEMPTS: int = 3
+    # Shared secret for the /api/queue endpoints (sent as X-Queue-Token); unset disables the check
+    QUEUE_TOKEN: Optional[str] = None
     
     class Config:
         case_sensitive = True
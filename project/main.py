@@ -29,6 +29,8 @@ app.add_middleware(
 try:
     from api.routes import router
     app.include_router(router, prefix="/api", tags=["extraction"])
+    from api.queue_routes import router as queue_router
+    app.include_router(queue_router, prefix="/api/queue", tags=["queue"])
     print("✅ Router included successfully")
 except ImportError as e:
     print(f"❌ Error importing router: {e}")
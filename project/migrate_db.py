@@ -0,0 +1,43 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+
+from database import Base, engine
+# Imported so the models' tables are registered on Base.metadata
+from models.db_models import Brand, Product  # noqa: F401
+
+
+def migrate(bind: Engine) -> list:
+    """
+    Add model columns and indexes missing from existing tables.
+    create_all() only creates missing tables; it never alters existing ones.
+    Returns the DDL statements that were applied.
+    """
+    applied = []
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                table.create(bind=conn)
+                applied.append(f"CREATE TABLE {table.name}")
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {CreateColumn(column).compile(dialect=bind.dialect)}"
+                conn.exec_driver_sql(ddl)
+                applied.append(ddl)
+            indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(bind=conn)
+                    applied.append(f"CREATE INDEX {index.name}")
+    return applied
+
+
+if __name__ == "__main__":
+    print("🔄 Migrating database schema...")
+    for statement in migrate(engine):
+        print(f"  {statement}")
+    print("✅ Schema is up to date!")
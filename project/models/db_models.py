@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DECIMAL, ForeignKey, TIMESTAMP, func
+from sqlalchemy import Column, Integer, Float, String, Text, DECIMAL, ForeignKey, TIMESTAMP, func
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -11,6 +11,21 @@ class Brand(Base):
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, onupdate=func.now())
 
+    # Recrawl scheduling (see services/recrawl_scheduler.py; add to existing DBs with migrate_db.py)
+    last_crawled_at = Column(TIMESTAMP, nullable=True)
+    next_crawl_at = Column(TIMESTAMP, nullable=True, index=True)
+    crawl_interval_seconds = Column(Integer, nullable=True)
+    crawl_count = Column(Integer, nullable=False, default=0, server_default="0")
+    catalog_hash = Column(String(64), nullable=True)
+    catalog_change_count = Column(Integer, nullable=False, default=0, server_default="0")
+    pages_hash = Column(String(64), nullable=True)
+    pages_change_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Smoothed share of recrawls that found a change, and smoothed time between them
+    change_ratio = Column(Float, nullable=True)
+    observed_interval_seconds = Column(Float, nullable=True)
+    last_request_cost = Column(Integer, nullable=True)
+    consecutive_failures = Column(Integer, nullable=False, default=0, server_default="0")
+
     products = relationship("Product", back_populates="brand")
 
 class Product(Base):
@@ -27,6 +27,51 @@ class BrandInsightsSchema(BaseModel):
     warnings: Optional[List[str]] = []
 
 
+class ProductSearchHit(BaseModel):
+    """Single ranked hit from the product search index"""
+    id: str
+    title: str
+    handle: Optional[str]
+    price: Optional[float]
+    product_url: Optional[str]
+    brand_name: Optional[str]
+    domain: str
+    score: float
+
+
+class ProductSearchResponseSchema(BaseModel):
+    """Schema for product search results"""
+    query: str
+    count: int
+    results: List[ProductSearchHit] = []
+
+
+class EnqueueRequest(BaseModel):
+    """Store URLs to add to the extraction job queue"""
+    urls: List[str]
+
+
+class JobSchema(BaseModel):
+    """Extraction job leased to a worker"""
+    id: int
+    website_url: str
+    domain: str
+    shard: int
+    attempts: int
+
+
+class CompleteJobRequest(BaseModel):
+    """Result reported by the worker holding a job"""
+    worker_id: str
+    result: Dict[str, Any]
+
+
+class FailJobRequest(BaseModel):
+    """Error reported by the worker holding a job"""
+    worker_id: str
+    error: str
+
+
 # -------------------------------
 # Shopify Entities
 # -------------------------------
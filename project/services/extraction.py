@@ -0,0 +1,60 @@
+from __future__ import annotations
+import logging
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from services.search_index import get_search_index
+from services.web_scraper import ShopifyScraper
+
+logger = logging.getLogger(__name__)
+
+
+def extract_store(website_url: str) -> Dict[str, Any]:
+    """
+    Run every ShopifyScraper extractor against one store and assemble
+    the brand insights payload (same shape as the /api/extract response).
+    """
+    started = time.monotonic()
+    base_url = ShopifyScraper.normalize_base(website_url)
+    # Brand name and the about fallback only need <head>, parsed once per distinct head
+    home_meta = ShopifyScraper.home_meta(base_url)
+
+    catalog, catalog_complete = ShopifyScraper.fetch_catalog(base_url)
+    data: Dict[str, Any] = {
+        "products": {
+            "catalog": catalog,
+            "hero_products": ShopifyScraper.extract_hero_products(base_url),
+            "total_count": len(catalog),
+            "featured_collections": ShopifyScraper.fetch_collections_lightweight(base_url),
+        },
+        "policies": ShopifyScraper.extract_policies(base_url),
+        "faqs": ShopifyScraper.extract_faqs(base_url),
+        "contact_info": ShopifyScraper.extract_socials_and_contact(base_url),
+        "brand_context": {
+            "about": ShopifyScraper.extract_about(base_url, home_meta=home_meta),
+        },
+        "important_links": ShopifyScraper.extract_important_links(base_url),
+    }
+
+    brand_name = home_meta["brand_name"] or urllib.parse.urlparse(base_url).netloc
+    warnings = []
+    if not catalog_complete:
+        warnings.append("Product catalog is incomplete: a products.json page failed")
+    try:
+        get_search_index().index_products(base_url, brand_name, catalog, complete=catalog_complete)
+    except Exception as e:
+        logger.warning(f"Search indexing failed for {base_url}: {e}")
+        warnings.append(f"Search indexing failed: {e}")
+
+    return {
+        "status": "success",
+        "brand_name": brand_name,
+        "website_url": base_url,
+        "data": data,
+        "extraction_timestamp": datetime.now(timezone.utc).isoformat(),
+        "processing_time_seconds": round(time.monotonic() - started, 2),
+        "errors": [],
+        "warnings": warnings,
+    }
@@ -0,0 +1,137 @@
+from __future__ import annotations
+import argparse
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from core.config import settings
+from services.extraction import extract_store
+from services.job_queue import JobQueue, open_queue
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionWorker:
+    """
+    Pulls extraction jobs from a shared JobQueue and runs them with
+    ShopifyScraper (via extract_store). The queue keeps each store domain on
+    a single worker and requeues jobs of dead workers. Workers on other
+    machines than the queue file use HTTPJobQueue against the API.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        worker_id: Optional[str] = None,
+        crawl: Callable[[str], Dict[str, Any]] = extract_store,
+        concurrency: int = 1,
+        heartbeat_seconds: float = settings.WORKER_HEARTBEAT_SECONDS,
+        poll_seconds: float = settings.WORKER_POLL_SECONDS,
+    ):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.crawl = crawl
+        self.concurrency = concurrency
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        # Set once in-flight jobs are done; keeps heartbeats going while they finish
+        self._drained = threading.Event()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._drained.wait(self.heartbeat_seconds):
+            try:
+                self.queue.heartbeat(self.worker_id)
+                self.queue.reap_dead_workers()
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for {self.worker_id}: {e}")
+
+    def run_once(self) -> bool:
+        """Claim and process a single job. Returns False when no job was available."""
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+        logger.info(f"[{self.worker_id}] job {job.id}: {job.website_url} (attempt {job.attempts})")
+        try:
+            result = self.crawl(job.website_url)
+        except Exception as e:
+            logger.warning(f"[{self.worker_id}] job {job.id} failed: {e}")
+            self.queue.fail(job.id, self.worker_id, str(e))
+            return True
+        if not self.queue.complete(job.id, self.worker_id, result):
+            logger.warning(f"[{self.worker_id}] job {job.id} was reassigned before completion")
+        return True
+
+    def _work_loop(self, done: threading.Event) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    busy = self.run_once()
+                except Exception as e:
+                    logger.error(f"[{self.worker_id}] queue error: {e}")
+                    busy = False
+                if not busy:
+                    self._stop.wait(self.poll_seconds)
+        finally:
+            done.set()
+
+    def run(self) -> None:
+        """
+        Block processing jobs until stop() is called (or KeyboardInterrupt).
+        Either way, jobs already claimed finish before the worker unregisters.
+        """
+        self.queue.heartbeat(self.worker_id)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        # Waited on instead of Thread.join(): a join interrupted by Ctrl-C
+        # marks the thread as finished while it is still running
+        done = [threading.Event() for _ in range(self.concurrency)]
+        workers = [threading.Thread(target=self._work_loop, args=(d,), daemon=True) for d in done]
+        logger.info(f"Worker {self.worker_id} started with {self.concurrency} slot(s)")
+        for t in [heartbeat] + workers:
+            t.start()
+        try:
+            for d in done:
+                d.wait()
+        finally:
+            # Stop claiming before unregistering: claim() re-registers the worker
+            self._stop.set()
+            for d in done:
+                d.wait()
+            self._drained.set()
+            heartbeat.join()
+            self.queue.unregister(self.worker_id)
+            logger.info(f"Worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shopify extraction queue worker")
+    parser.add_argument("--queue", default=settings.QUEUE_PATH,
+                        help="Local queue file, or the coordinator's queue URL "
+                             "(e.g. http://coordinator:8000/api/queue) for workers on other nodes")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--enqueue", metavar="FILE", help="Enqueue one URL per line from FILE and exit")
+    args = parser.parse_args()
+
+    queue = open_queue(args.queue)
+    if args.enqueue:
+        with open(args.enqueue) as f:
+            ids = queue.enqueue_many(line.strip() for line in f if line.strip())
+        print(f"Enqueued {len(ids)} job(s)")
+        return
+
+    worker = ExtractionWorker(queue, concurrency=args.concurrency)
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        pass  # run() already drained its jobs and unregistered
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
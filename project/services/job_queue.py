@@ -0,0 +1,354 @@
+from __future__ import annotations
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+from core.config import settings
+from utils.helpers import store_domain
+
+
+def shard_for(domain: str, num_shards: int) -> int:
+    """Stable domain -> shard mapping (identical on every node)."""
+    digest = hashlib.sha1(domain.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards
+
+
+@dataclass
+class Job:
+    id: int
+    website_url: str
+    domain: str
+    shard: int
+    attempts: int
+
+
+class JobQueue(ABC):
+    """
+    Shared extraction job queue.
+
+    Jobs are sharded by store domain and every shard is leased to a single
+    live worker, so one domain's requests (and its rate limit / connection
+    pool) always stay on one node. Workers heartbeat; when a worker stops
+    heartbeating its shards are released and its running jobs are requeued.
+    """
+
+    @abstractmethod
+    def enqueue(self, website_url: str) -> int: ...
+
+    @abstractmethod
+    def heartbeat(self, worker_id: str) -> None: ...
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Job]: ...
+
+    @abstractmethod
+    def complete(self, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool: ...
+
+    @abstractmethod
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool: ...
+
+    @abstractmethod
+    def reap_dead_workers(self) -> int: ...
+
+    @abstractmethod
+    def unregister(self, worker_id: str) -> None: ...
+
+    def enqueue_many(self, urls: Iterable[str]) -> List[int]:
+        return [self.enqueue(u) for u in urls]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    last_heartbeat REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    shard INTEGER PRIMARY KEY,
+    owner TEXT
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    website_url TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status_shard ON jobs(status, shard, id);
+CREATE INDEX IF NOT EXISTS jobs_worker ON jobs(worker_id, status);
+"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    JobQueue on a local SQLite file, for worker processes on ONE host.
+    SQLite locking is not reliable on network/shared filesystems, so the
+    file must not be shared between machines; workers on other nodes reach
+    it through the API's /api/queue endpoints with HTTPJobQueue.
+    Pass ":memory:" for an in-process stand-in (e.g. in tests).
+    Every state change runs in a BEGIN IMMEDIATE transaction, so
+    concurrent claimers across processes are serialized by SQLite.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.QUEUE_PATH,
+        num_shards: int = settings.QUEUE_NUM_SHARDS,
+        dead_after: float = settings.WORKER_DEAD_AFTER_SECONDS,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        clock=time.time,
+    ):
+        self.num_shards = num_shards
+        self.dead_after = dead_after
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        # Rollback journal: WAL relies on shared memory and gains nothing here
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        with self._tx() as c:
+            for stmt in filter(str.strip, _SCHEMA.split(";")):
+                c.execute(stmt)
+            c.executemany(
+                "INSERT OR IGNORE INTO shards (shard, owner) VALUES (?, NULL)",
+                [(i,) for i in range(num_shards)]
+            )
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # ---------- Producers ----------
+    def enqueue(self, website_url: str) -> int:
+        domain = store_domain(website_url)
+        with self._tx() as c:
+            cur = c.execute(
+                "INSERT INTO jobs (website_url, domain, shard, enqueued_at) VALUES (?, ?, ?, ?)",
+                (website_url, domain, shard_for(domain, self.num_shards), self._clock())
+            )
+            return cur.lastrowid
+
+    # ---------- Workers ----------
+    def heartbeat(self, worker_id: str) -> None:
+        with self._tx() as c:
+            self._touch(c, worker_id)
+            # Rebalancing here too lets busy workers hand shards to newcomers
+            self._rebalance(c, worker_id)
+
+    def _touch(self, c: sqlite3.Connection, worker_id: str) -> None:
+        c.execute(
+            "INSERT INTO workers (worker_id, last_heartbeat) VALUES (?, ?)"
+            " ON CONFLICT(worker_id) DO UPDATE SET last_heartbeat = excluded.last_heartbeat",
+            (worker_id, self._clock())
+        )
+
+    def unregister(self, worker_id: str) -> None:
+        with self._tx() as c:
+            self._release_worker(c, worker_id)
+
+    def _release_worker(self, c: sqlite3.Connection, worker_id: str) -> None:
+        c.execute("UPDATE shards SET owner = NULL WHERE owner = ?", (worker_id,))
+        c.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+            " worker_id = NULL, error = 'worker lost' WHERE worker_id = ? AND status = 'running'",
+            (self.max_attempts, worker_id)
+        )
+        c.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+
+    def reap_dead_workers(self) -> int:
+        """Release shards and requeue running jobs of workers that stopped heartbeating."""
+        cutoff = self._clock() - self.dead_after
+        with self._tx() as c:
+            dead = [r["worker_id"] for r in c.execute(
+                "SELECT worker_id FROM workers WHERE last_heartbeat < ?", (cutoff,)
+            )]
+            for worker_id in dead:
+                self._release_worker(c, worker_id)
+        return len(dead)
+
+    def _rebalance(self, c: sqlite3.Connection, worker_id: str) -> None:
+        """Converge on an even split of shards across live workers."""
+        live = c.execute("SELECT COUNT(*) FROM workers").fetchone()[0] or 1
+        fair = math.ceil(self.num_shards / live)
+        owned = c.execute("SELECT COUNT(*) FROM shards WHERE owner = ?", (worker_id,)).fetchone()[0]
+        if owned < fair:
+            # Prefer free shards that have work waiting
+            c.execute(
+                "UPDATE shards SET owner = ? WHERE shard IN ("
+                " SELECT s.shard FROM shards s WHERE s.owner IS NULL"
+                " ORDER BY EXISTS (SELECT 1 FROM jobs j WHERE j.shard = s.shard"
+                " AND j.status = 'pending') DESC, s.shard LIMIT ?)",
+                (worker_id, fair - owned)
+            )
+        elif owned > fair:
+            # Hand back shards this worker is not actively crawling
+            c.execute(
+                "UPDATE shards SET owner = NULL WHERE shard IN ("
+                " SELECT s.shard FROM shards s WHERE s.owner = ?"
+                " AND NOT EXISTS (SELECT 1 FROM jobs j WHERE j.shard = s.shard"
+                " AND j.status = 'running') ORDER BY s.shard DESC LIMIT ?)",
+                (worker_id, owned - fair)
+            )
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """Take the oldest pending job from a shard this worker owns."""
+        now = self._clock()
+        with self._tx() as c:
+            self._touch(c, worker_id)
+            self._rebalance(c, worker_id)
+            row = c.execute(
+                "SELECT j.id, j.website_url, j.domain, j.shard, j.attempts FROM jobs j"
+                " JOIN shards s ON s.shard = j.shard AND s.owner = ?"
+                " WHERE j.status = 'pending' AND NOT EXISTS ("
+                "  SELECT 1 FROM jobs r WHERE r.domain = j.domain AND r.status = 'running')"
+                " ORDER BY j.id LIMIT 1",
+                (worker_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            c.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, attempts = attempts + 1,"
+                " started_at = ? WHERE id = ?",
+                (worker_id, now, row["id"])
+            )
+        return Job(
+            id=row["id"], website_url=row["website_url"], domain=row["domain"],
+            shard=row["shard"], attempts=row["attempts"] + 1
+        )
+
+    def _finish(self, job_id: int, worker_id: str, status: str, result: Optional[str], error: Optional[str]) -> bool:
+        with self._tx() as c:
+            cur = c.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, worker_id = NULL"
+                " WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (status, result, error, self._clock(), job_id, worker_id)
+            )
+            # False means the job was reassigned after this worker was presumed dead
+            return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        return self._finish(job_id, worker_id, "done", json.dumps(result, default=str), None)
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        retry = row is not None and row["attempts"] < self.max_attempts
+        return self._finish(job_id, worker_id, "pending" if retry else "failed", None, error)
+
+    # ---------- Introspection ----------
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+    def result(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["result"]) if row and row["result"] else None
+
+
+class HTTPJobQueue(JobQueue):
+    """
+    JobQueue client for worker nodes. Every call goes to the /api/queue
+    endpoints of the coordinator (the API app), which holds the
+    SQLiteJobQueue on its local disk, so workers can run on any machine
+    that reaches it. Network errors surface as httpx.HTTPError.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: Optional[str] = settings.QUEUE_TOKEN,
+        timeout: float = settings.REQUEST_TIMEOUT,
+        client: Optional[httpx.Client] = None,
+    ):
+        # e.g. http://coordinator:8000/api/queue
+        self._client = client or httpx.Client(base_url=base_url.rstrip("/"), timeout=timeout)
+        self._headers = {"X-Queue-Token": token} if token else {}
+
+    def _call(self, method: str, path: str, **kwargs: Any) -> Any:
+        r = self._client.request(method, path, headers=self._headers, **kwargs)
+        r.raise_for_status()
+        return r.json()
+
+    # ---------- Producers ----------
+    def enqueue(self, website_url: str) -> int:
+        return self.enqueue_many([website_url])[0]
+
+    def enqueue_many(self, urls: Iterable[str]) -> List[int]:
+        return self._call("POST", "/jobs", json={"urls": list(urls)})["ids"]
+
+    # ---------- Workers ----------
+    def heartbeat(self, worker_id: str) -> None:
+        self._call("POST", f"/workers/{worker_id}/heartbeat")
+
+    def unregister(self, worker_id: str) -> None:
+        self._call("DELETE", f"/workers/{worker_id}")
+
+    def reap_dead_workers(self) -> int:
+        return self._call("POST", "/reap")["reaped"]
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        job = self._call("POST", f"/workers/{worker_id}/claim")
+        return Job(**job) if job else None
+
+    def complete(self, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        # Round-trip through json.dumps like SQLiteJobQueue (datetimes etc. become strings)
+        payload = {"worker_id": worker_id, "result": json.loads(json.dumps(result, default=str))}
+        return self._call("POST", f"/jobs/{job_id}/complete", json=payload)["ok"]
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        return self._call("POST", f"/jobs/{job_id}/fail", json={"worker_id": worker_id, "error": error})["ok"]
+
+    # ---------- Introspection ----------
+    def counts(self) -> Dict[str, int]:
+        return self._call("GET", "/counts")
+
+    def result(self, job_id: int) -> Optional[Dict[str, Any]]:
+        return self._call("GET", f"/jobs/{job_id}/result")
+
+
+def open_queue(location: str) -> JobQueue:
+    """HTTPJobQueue for an http(s):// coordinator URL, SQLiteJobQueue for a local path."""
+    if location.startswith(("http://", "https://")):
+        return HTTPJobQueue(location)
+    return SQLiteJobQueue(location)
+
+
+_queue: Optional[SQLiteJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> SQLiteJobQueue:
+    """Return the coordinator's queue (served under /api/queue)."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = SQLiteJobQueue(settings.QUEUE_PATH)
+    return _queue
@@ -0,0 +1,260 @@
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_
+
+from core.config import settings
+from database import SessionLocal
+from models.db_models import Brand
+from services.extraction import extract_store
+from services.web_scraper import PRODUCTS_PER_PAGE
+
+logger = logging.getLogger(__name__)
+
+# Rough number of HTTP requests an extraction spends outside /products.json
+# (homepage, policy/FAQ/contact/about probes, important links).
+PAGE_REQUESTS_ESTIMATE = 45
+
+# Intervals are tuned so that roughly this share of crawls finds a change
+TARGET_CHANGE_PROBABILITY = 0.5
+# A page-only change counts as half a catalog change
+PAGES_CHANGE_WEIGHT = 0.5
+# Weight of the newest recrawl in the smoothed change ratio and interval
+RATE_SMOOTHING = 0.15
+# Keeps -ln(1 - ratio) finite and non-zero
+MIN_CHANGE_RATIO = 0.01
+MAX_CHANGE_RATIO = 0.99
+
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint(result: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Return (catalog_hash, pages_hash) for an extraction result. The catalog
+    hash covers /products.json; everything else (hero products, featured
+    collections, policies, FAQs, contact, ...) goes into the pages hash.
+    """
+    data = dict(result.get("data") or {})
+    products = dict(data.get("products") or {})
+    catalog = sorted(
+        (products.pop("catalog", None) or []),
+        key=lambda p: str(p.get("id") or p.get("handle") or "")
+    )
+    products.pop("total_count", None)  # derived from the catalog
+    data["products"] = products
+    return _digest(catalog), _digest(data)
+
+
+def estimate_request_cost(result: Dict[str, Any]) -> int:
+    """Approximate how many HTTP requests an extraction needed."""
+    total = ((result.get("data") or {}).get("products") or {}).get("total_count") or 0
+    return PAGE_REQUESTS_ESTIMATE + total // PRODUCTS_PER_PAGE + 1
+
+
+class RequestBudget:
+    """Sliding one-hour window of HTTP requests shared by all workers."""
+
+    def __init__(self, per_hour: int, clock: Callable[[], float] = time.monotonic):
+        self.per_hour = per_hour
+        self._clock = clock
+        self._spent: Deque[Tuple[float, int]] = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._spent and now - self._spent[0][0] >= 3600:
+            self._spent.popleft()
+
+    def remaining(self) -> int:
+        with self._lock:
+            self._expire(self._clock())
+            return self.per_hour - sum(cost for _, cost in self._spent)
+
+    def try_acquire(self, cost: int) -> bool:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            if sum(c for _, c in self._spent) + cost > self.per_hour:
+                return False
+            self._spent.append((now, cost))
+            return True
+
+    def adjust(self, reserved: int, actual: int) -> None:
+        """Charge the difference between a reservation and the real cost."""
+        if actual != reserved:
+            with self._lock:
+                self._spent.append((self._clock(), actual - reserved))
+
+
+class RecrawlScheduler:
+    """
+    Recrawls tracked brands on a per-brand interval that adapts to how
+    often each store's catalog and pages actually change.
+
+    Each brand's change rate is estimated from exponentially weighted averages
+    of whether its recrawls found a catalog or page change and of the time
+    between them, so the estimate follows stores whose behavior changes;
+    stores that change often are revisited sooner and static ones are backed
+    off, so crawl capacity goes where content moves.
+    Due brands are run through a bounded thread pool; brands that do not
+    fit in what is left of the hourly request budget are deferred.
+    """
+
+    def __init__(
+        self,
+        crawl: Callable[[str], Dict[str, Any]] = extract_store,
+        session_factory: Callable[[], Any] = SessionLocal,
+        max_workers: int = settings.RECRAWL_MAX_WORKERS,
+        requests_per_hour: int = settings.RECRAWL_REQUESTS_PER_HOUR,
+        min_interval: int = settings.RECRAWL_MIN_INTERVAL_SECONDS,
+        max_interval: int = settings.RECRAWL_MAX_INTERVAL_SECONDS,
+        default_interval: int = settings.RECRAWL_DEFAULT_INTERVAL_SECONDS,
+    ):
+        self.crawl = crawl
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self.budget = RequestBudget(requests_per_hour)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self._stop = threading.Event()
+
+    # ---------- Interval policy ----------
+    @staticmethod
+    def change_rate(brand: Brand) -> float:
+        """
+        Estimated changes per second, treating changes as a Poisson process:
+        a crawl after t seconds finds a change with probability 1 - exp(-rate * t),
+        so rate = -ln(1 - ratio) / t over the smoothed ratio and interval.
+        """
+        ratio = min(MAX_CHANGE_RATIO, max(MIN_CHANGE_RATIO, brand.change_ratio))
+        return -math.log(1 - ratio) / brand.observed_interval_seconds
+
+    def next_interval(self, brand: Brand) -> int:
+        """Interval at which a crawl finds a change with TARGET_CHANGE_PROBABILITY."""
+        interval = -math.log(1 - TARGET_CHANGE_PROBABILITY) / self.change_rate(brand)
+        return int(min(self.max_interval, max(self.min_interval, interval)))
+
+    def record_crawl(self, brand: Brand, result: Dict[str, Any], now: datetime) -> None:
+        """Update a brand's change history and schedule its next crawl."""
+        catalog_hash, pages_hash = fingerprint(result)
+        first_crawl = brand.last_crawled_at is None
+        catalog_changed = not first_crawl and catalog_hash != brand.catalog_hash
+        pages_changed = not first_crawl and pages_hash != brand.pages_hash
+
+        brand.crawl_count = (brand.crawl_count or 0) + 1
+        brand.consecutive_failures = 0
+        brand.catalog_change_count = (brand.catalog_change_count or 0) + int(catalog_changed)
+        brand.pages_change_count = (brand.pages_change_count or 0) + int(pages_changed)
+        if first_crawl:
+            interval = brand.crawl_interval_seconds or self.default_interval
+        else:
+            changed = 1.0 if catalog_changed else PAGES_CHANGE_WEIGHT if pages_changed else 0.0
+            elapsed = max(1.0, (now - brand.last_crawled_at).total_seconds())
+            if brand.change_ratio is None or brand.observed_interval_seconds is None:
+                # Start from a neutral prior observed at the first interval
+                brand.change_ratio = TARGET_CHANGE_PROBABILITY
+                brand.observed_interval_seconds = elapsed
+            brand.change_ratio += RATE_SMOOTHING * (changed - brand.change_ratio)
+            brand.observed_interval_seconds += RATE_SMOOTHING * (elapsed - brand.observed_interval_seconds)
+            interval = self.next_interval(brand)
+
+        brand.catalog_hash = catalog_hash
+        brand.pages_hash = pages_hash
+        brand.crawl_interval_seconds = interval
+        brand.last_crawled_at = now
+        brand.next_crawl_at = now + timedelta(seconds=interval)
+        brand.last_request_cost = estimate_request_cost(result)
+
+    def record_failure(self, brand: Brand, now: datetime) -> None:
+        """
+        Retry a failed brand with exponential backoff (min_interval doubling per
+        consecutive failure, capped at max_interval) without touching its history.
+        """
+        brand.consecutive_failures = (brand.consecutive_failures or 0) + 1
+        backoff = self.min_interval * 2 ** min(brand.consecutive_failures - 1, 32)
+        brand.next_crawl_at = now + timedelta(seconds=min(self.max_interval, backoff))
+
+    # ---------- Dispatch ----------
+    def due_brands(self, session, now: datetime, limit: int) -> List[Brand]:
+        return (
+            session.query(Brand)
+            .filter(or_(Brand.next_crawl_at.is_(None), Brand.next_crawl_at <= now))
+            .order_by(Brand.next_crawl_at.is_(None).desc(), Brand.next_crawl_at)
+            .limit(limit)
+            .all()
+        )
+
+    def run_due(self, now: Optional[datetime] = None, limit: int = 100) -> Dict[str, int]:
+        """
+        Crawl every brand that is due (up to `limit`) within the request budget.
+        DB access stays on the calling thread; workers only run the crawl.
+        """
+        now = now or datetime.utcnow()
+        stats = {"crawled": 0, "failed": 0, "deferred": 0}
+        session = self.session_factory()
+        try:
+            brands = self.due_brands(session, now, limit)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {}
+                for brand in brands:
+                    # A store bigger than the whole hourly budget reserves the full
+                    # budget, so it still runs once the window is clear
+                    cost = min(brand.last_request_cost or PAGE_REQUESTS_ESTIMATE, self.budget.per_hour)
+                    if not self.budget.try_acquire(cost):
+                        # Smaller brands further down may still fit
+                        stats["deferred"] += 1
+                        continue
+                    futures[pool.submit(self.crawl, brand.website_url)] = (brand, cost)
+
+                for future in as_completed(futures):
+                    brand, cost = futures[future]
+                    finished = datetime.utcnow()
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning(f"Recrawl failed for {brand.website_url}: {e}")
+                        self.record_failure(brand, finished)
+                        stats["failed"] += 1
+                        continue
+                    self.record_crawl(brand, result, finished)
+                    self.budget.adjust(cost, brand.last_request_cost)
+                    stats["crawled"] += 1
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        return stats
+
+    def run_forever(self, poll_seconds: float = settings.RECRAWL_POLL_SECONDS) -> None:
+        logger.info("Recrawl scheduler started")
+        while not self._stop.is_set():
+            try:
+                stats = self.run_due()
+                if stats["crawled"] or stats["failed"] or stats["deferred"]:
+                    logger.info(f"Recrawl pass: {stats}")
+            except Exception as e:
+                logger.error(f"Recrawl pass failed: {e}")
+            self._stop.wait(poll_seconds)
+        logger.info("Recrawl scheduler stopped")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    RecrawlScheduler().run_forever()
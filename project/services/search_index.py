@@ -0,0 +1,235 @@
+from __future__ import annotations
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.config import settings
+from utils.helpers import store_domain, strip_html
+
+# Column weights for bm25(): title, description, handle
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    domain TEXT NOT NULL,
+    product_key TEXT NOT NULL,
+    brand_name TEXT,
+    title TEXT NOT NULL,
+    description TEXT,
+    handle TEXT,
+    price REAL,
+    product_url TEXT,
+    row_hash TEXT NOT NULL,
+    UNIQUE (domain, product_key)
+);
+CREATE INDEX IF NOT EXISTS products_price ON products(price);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    title, description, handle,
+    content='products', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS products_ai AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts(rowid, title, description, handle)
+    VALUES (new.id, new.title, new.description, new.handle);
+END;
+CREATE TRIGGER IF NOT EXISTS products_ad AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, title, description, handle)
+    VALUES ('delete', old.id, old.title, old.description, old.handle);
+END;
+CREATE TRIGGER IF NOT EXISTS products_au AFTER UPDATE ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, title, description, handle)
+    VALUES ('delete', old.id, old.title, old.description, old.handle);
+    INSERT INTO products_fts(rowid, title, description, handle)
+    VALUES (new.id, new.title, new.description, new.handle);
+END;
+"""
+
+
+def _price(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def to_match_query(text: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression: every word is quoted
+    (so FTS5 operators in user input are inert) and the last one is a prefix.
+    """
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    quoted = ['"' + t + '"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class ProductSearchIndex:
+    """
+    Local SQLite FTS5 index of scraped products across all brands.
+    Re-indexing a store only writes products whose fields changed and
+    drops the ones no longer in its catalog.
+
+    Writes go through one connection guarded by a lock; searches use a
+    read connection per thread, so (with WAL) a large reindex does not
+    block queries.
+    """
+
+    def __init__(self, path: Path):
+        self._path = str(path)
+        self._memory = self._path == ":memory:"
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if not self._memory:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(Path(self._path).resolve().as_uri() + "?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # ---------- Indexing ----------
+    def index_products(
+        self,
+        website_url: str,
+        brand_name: Optional[str],
+        products: List[Dict[str, Any]],
+        complete: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Upsert a store's catalog (as returned by fetch_catalog). Products missing
+        from it are only dropped when the catalog is complete and non-empty, so a
+        failed or rate-limited fetch never wipes a store from the index.
+        """
+        domain = store_domain(website_url)
+        rows: Dict[str, tuple] = {}
+        for p in products:
+            key = str(p.get("id") or p.get("handle") or "")
+            if not key or not p.get("title"):
+                continue
+            fields = (
+                brand_name,
+                p.get("title"),
+                strip_html(p.get("description") or ""),
+                p.get("handle"),
+                _price(p.get("price")),
+                p.get("product_url"),
+            )
+            row_hash = hashlib.sha1(json.dumps(fields).encode("utf-8")).hexdigest()
+            rows[key] = fields + (row_hash,)
+
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        with self._lock, self._conn:
+            existing = {
+                r["product_key"]: r["row_hash"]
+                for r in self._conn.execute(
+                    "SELECT product_key, row_hash FROM products WHERE domain = ?", (domain,)
+                )
+            }
+            for key, values in rows.items():
+                if key not in existing:
+                    self._conn.execute(
+                        "INSERT INTO products (domain, product_key, brand_name, title, description,"
+                        " handle, price, product_url, row_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (domain, key) + values
+                    )
+                    stats["added"] += 1
+                elif existing[key] != values[-1]:
+                    self._conn.execute(
+                        "UPDATE products SET brand_name = ?, title = ?, description = ?, handle = ?,"
+                        " price = ?, product_url = ?, row_hash = ? WHERE domain = ? AND product_key = ?",
+                        values + (domain, key)
+                    )
+                    stats["updated"] += 1
+                else:
+                    stats["unchanged"] += 1
+
+            removed = [k for k in existing if k not in rows] if complete and rows else []
+            self._conn.executemany(
+                "DELETE FROM products WHERE domain = ? AND product_key = ?",
+                [(domain, k) for k in removed]
+            )
+            stats["removed"] = len(removed)
+        return stats
+
+    # ---------- Querying ----------
+    def search(
+        self,
+        query: str,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        domain: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Ranked (bm25) product search with optional price and store filters."""
+        match = to_match_query(query)
+        if not match:
+            return []
+        sql = [
+            "SELECT p.domain, p.product_key, p.brand_name, p.title, p.handle, p.price,"
+            " p.product_url, bm25(products_fts, ?, ?, ?) AS score"
+            " FROM products_fts JOIN products p ON p.id = products_fts.rowid"
+            " WHERE products_fts MATCH ?"
+        ]
+        params: List[Any] = list(BM25_WEIGHTS) + [match]
+        if min_price is not None:
+            sql.append("AND p.price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            sql.append("AND p.price <= ?")
+            params.append(max_price)
+        if domain:
+            sql.append("AND p.domain = ?")
+            params.append(store_domain(domain))
+        sql.append("ORDER BY score LIMIT ? OFFSET ?")
+        params += [limit, offset]
+
+        if self._memory:
+            # An in-memory index exists only on the writer connection
+            with self._lock:
+                rows = self._conn.execute(" ".join(sql), params).fetchall()
+        else:
+            rows = self._reader().execute(" ".join(sql), params).fetchall()
+        return [
+            {
+                "id": r["product_key"],
+                "title": r["title"],
+                "handle": r["handle"],
+                "price": r["price"],
+                "product_url": r["product_url"],
+                "brand_name": r["brand_name"],
+                "domain": r["domain"],
+                "score": -r["score"],
+            }
+            for r in rows
+        ]
+
+
+_index: Optional[ProductSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> ProductSearchIndex:
+    """Return the shared product search index."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ProductSearchIndex(Path(settings.SEARCH_INDEX_PATH))
+    return _index
@@ -5,14 +5,173 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from bs4 import BeautifulSoup
 from utils.helpers import (
-    ensure_url, join_url, fetch_html, fetch_json, get_text, find_common_page,
-    extract_meta_brand_name
+    ensure_url, join_url, fetch_html, fetch_json, fetch_text, get_text,
+    find_common_page, extract_meta_brand_name, stop_after_end_tag
 )
+from utils.parse_cache import memoize_parse
 
 
 PRODUCTS_PER_PAGE = 250  # Shopify max
 
 
+def _soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, "html.parser")
+
+
+# ---------- Memoized page parsers ----------
+# Each parser is keyed on the hash of the page body plus its version,
+# so unchanged pages skip BeautifulSoup and extraction entirely.
+@memoize_parse("collections", 1)
+def _parse_collections(html: str, base_url: str) -> List[Dict[str, Any]]:
+    soup = _soup(html)
+    colls: Dict[str, Dict[str, Any]] = {}
+    for a in soup.select("a[href*='/collections/']"):
+        href = a.get("href") or ""
+        if not href:
+            continue
+        abs_url = urllib.parse.urljoin(base_url, href)
+        handle = abs_url.split("/collections/")[-1].strip("/").split("?")[0]
+        if not handle or handle.startswith(("all", "frontpage")):
+            continue
+        title = a.get_text(strip=True) or handle.replace("-", " ").title()
+        colls[handle] = {
+            "id": None,
+            "title": title,
+            "handle": handle,
+            "description": "",
+            "published_at": None,
+            "updated_at": None,
+            "image": None,
+            "products_count": None
+        }
+    return list(colls.values())
+
+
+@memoize_parse("hero_products", 1)
+def _parse_hero_products(html: str, base_url: str) -> List[Dict[str, Any]]:
+    soup = _soup(html)
+    seen = set()
+    heroes: List[Dict[str, Any]] = []
+    for a in soup.select("a[href*='/products/']"):
+        href = a.get("href") or ""
+        url = urllib.parse.urljoin(base_url, href)
+        handle = url.split("/products/")[-1].strip("/").split("?")[0]
+        title = a.get_text(" ", strip=True)
+        if not handle or handle in seen:
+            continue
+        seen.add(handle)
+        heroes.append({
+            "id": None,
+            "title": title or handle.replace("-", " ").title(),
+            "handle": handle,
+            "description": None,
+            "price": None,
+            "images": [],
+            "product_url": url
+        })
+        if len(heroes) >= 24:  # keep it reasonable
+            break
+    return heroes
+
+
+@memoize_parse("faqs", 1)
+def _parse_faqs(html: str) -> List[Dict[str, str]]:
+    soup = _soup(html)
+    faqs: List[Dict[str, str]] = []
+
+    # Q/A blocks (common on Shopify themes)
+    for block in soup.select("[data-accordion], details, .faq, .accordion"):
+        q = block.select_one("summary, h3, h4, .question, .faq__question")
+        a = block.select_one("div, p, .answer, .faq__answer")
+        q_text = (q.get_text(" ", strip=True) if q else "").strip()
+        a_text = (a.get_text(" ", strip=True) if a else "").strip()
+        if q_text and a_text and len(q_text) > 3:
+            faqs.append({"question": q_text, "answer": a_text})
+
+    # Fallback regex for inline Q:/A:
+    if not faqs:
+        text = get_text(soup)
+        pairs = re.findall(r"(?:^|\n|\r)(Q[:\)]?\s*)(.+?)(?:\n|\r)+(A[:\)]?\s*)(.+?)(?=\n|\r|$)", text, flags=re.I | re.S)
+        for _, q, __, a in pairs:
+            q = q.strip()
+            a = a.strip()
+            if q and a:
+                faqs.append({"question": q, "answer": a})
+
+    return faqs[:50]
+
+
+@memoize_parse("socials_and_contact", 1)
+def _parse_socials_and_contact(html: str) -> Dict[str, Any]:
+    soup = _soup(html)
+    text = html + " " + get_text(soup)
+
+    # Socials via anchors (most reliable)
+    socials = {
+        "facebook": None, "instagram": None, "twitter": None, "tiktok": None,
+        "youtube": None, "linkedin": None, "pinterest": None
+    }
+    for a in soup.select("a[href]"):
+        href = a["href"]
+        if "facebook.com" in href:
+            socials["facebook"] = href
+        elif "instagram.com" in href:
+            socials["instagram"] = href
+        elif "twitter.com" in href or "x.com" in href:
+            socials["twitter"] = href
+        elif "tiktok.com" in href:
+            socials["tiktok"] = href
+        elif "youtube.com" in href or "youtu.be" in href:
+            socials["youtube"] = href
+        elif "linkedin.com" in href:
+            socials["linkedin"] = href
+        elif "pinterest." in href:
+            socials["pinterest"] = href
+
+    # Emails & phones via regex
+    emails = sorted(set(re.findall(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)))
+    phones = sorted(set(re.findall(r"(?:\+?\d[\d\s\-]{7,}\d)", text)))
+
+    return {
+        "emails": emails,
+        "phones": phones,
+        "social_handles": {k: v for k, v in socials.items() if v}
+    }
+
+
+@memoize_parse("address", 1)
+def _parse_address(html: str) -> Optional[str]:
+    c_soup = _soup(html)
+    # Try schema.org postal addresses
+    node = c_soup.select_one("[itemtype*='PostalAddress']")
+    address = get_text(node) if node else None
+    if not address:
+        # Try footer/company box
+        maybe = c_soup.select_one("address, .footer__content, .shopify-section--footer")
+        if maybe:
+            address = get_text(maybe)
+    return address
+
+
+@memoize_parse("about", 1)
+def _parse_about(html: str) -> str:
+    return get_text(_soup(html))[:4000]
+
+
+def _meta_description(soup: BeautifulSoup) -> Optional[str]:
+    meta = soup.select_one("meta[name='description']")
+    return meta["content"][:4000] if meta and meta.get("content") else None
+
+
+@memoize_parse("home_meta", 1)
+def _parse_home_meta(html: str) -> Dict[str, Optional[str]]:
+    soup = _soup(html)
+    return {
+        "brand_name": extract_meta_brand_name(soup),
+        "description": _meta_description(soup),
+    }
+
+
 class ShopifyScraper:
     # ---------- Base ----------
     @staticmethod
@@ -23,6 +182,11 @@ class ShopifyScraper:
     def home(base_url: str) -> Tuple[str, BeautifulSoup]:
         return fetch_html(base_url)
 
+    @staticmethod
+    def home_meta(base_url: str) -> Dict[str, Optional[str]]:
+        """Brand name and meta description from the homepage <head> (memoized on its hash)."""
+        return _parse_home_meta(fetch_text(base_url, stop=[stop_after_end_tag("head")]))
+
     # ---------- Catalog ----------
     @staticmethod
     def fetch_all_products(base_url: str) -> List[Dict[str, Any]]:
@@ -30,6 +194,14 @@ class ShopifyScraper:
         Use the public /products.json endpoint (no Shopify admin API).
         Paginates by 'page' and stops when empty.
         """
+        return ShopifyScraper.fetch_catalog(base_url)[0]
+
+    @staticmethod
+    def fetch_catalog(base_url: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Same as fetch_all_products, plus whether paging reached an empty page.
+        False means a page failed (429, 5xx, bad JSON) and the catalog is truncated.
+        """
         out: List[Dict[str, Any]] = []
         page = 1
         while True:
@@ -38,8 +210,10 @@ class ShopifyScraper:
                 f"products.json?limit={PRODUCTS_PER_PAGE}&page={page}"
             )
             data = fetch_json(url)
-            if not data or not data.get("products"):
-                break
+            if not data or not isinstance(data.get("products"), list):
+                return out, False
+            if not data["products"]:
+                return out, True
             for p in data["products"]:
                 out.append({
                     "id": p.get("id"),
@@ -51,7 +225,6 @@ class ShopifyScraper:
                     "product_url": join_url(base_url, f"products/{p.get('handle')}")
                 })
             page += 1
-        return out
 
     # ---------- Collections (featured) ----------
     @staticmethod
@@ -60,55 +233,12 @@ class ShopifyScraper:
         There is no stable collections.json on all stores; instead,
         we mine common collection links from the homepage nav and sections.
         """
-        _, soup = fetch_html(base_url)
-        colls: Dict[str, Dict[str, Any]] = {}
-        for a in soup.select("a[href*='/collections/']"):
-            href = a.get("href") or ""
-            if not href:
-                continue
-            abs_url = urllib.parse.urljoin(base_url, href)
-            handle = abs_url.split("/collections/")[-1].strip("/").split("?")[0]
-            if not handle or handle.startswith(("all", "frontpage")):
-                continue
-            title = a.get_text(strip=True) or handle.replace("-", " ").title()
-            colls[handle] = {
-                "id": None,
-                "title": title,
-                "handle": handle,
-                "description": "",
-                "published_at": None,
-                "updated_at": None,
-                "image": None,
-                "products_count": None
-            }
-        return list(colls.values())
+        return _parse_collections(fetch_text(base_url), base_url)
 
     # ---------- Hero products (from homepage) ----------
     @staticmethod
     def extract_hero_products(base_url: str) -> List[Dict[str, Any]]:
-        _, soup = fetch_html(base_url)
-        seen = set()
-        heroes: List[Dict[str, Any]] = []
-        for a in soup.select("a[href*='/products/']"):
-            href = a.get("href") or ""
-            url = urllib.parse.urljoin(base_url, href)
-            handle = url.split("/products/")[-1].strip("/").split("?")[0]
-            title = a.get_text(" ", strip=True)
-            if not handle or handle in seen:
-                continue
-            seen.add(handle)
-            heroes.append({
-                "id": None,
-                "title": title or handle.replace("-", " ").title(),
-                "handle": handle,
-                "description": None,
-                "price": None,
-                "images": [],
-                "product_url": url
-            })
-            if len(heroes) >= 24:  # keep it reasonable
-                break
-        return heroes
+        return _parse_hero_products(fetch_text(base_url), base_url)
 
     # ---------- Policies ----------
     @staticmethod
@@ -137,8 +267,6 @@ class ShopifyScraper:
             url = find_common_page(base_url, [path])
             if not url:
                 continue
-            html, soup = fetch_html(url)
-            text = get_text(soup)
             lower = path.lower()
             if "privacy" in lower:
                 policies["privacy_policy"] = url
@@ -166,99 +294,54 @@ class ShopifyScraper:
         if not url:
             return []
 
-        _, soup = fetch_html(url)
-        faqs: List[Dict[str, str]] = []
-
-        # Q/A blocks (common on Shopify themes)
-        for block in soup.select("[data-accordion], details, .faq, .accordion"):
-            q = block.select_one("summary, h3, h4, .question, .faq__question")
-            a = block.select_one("div, p, .answer, .faq__answer")
-            q_text = (q.get_text(" ", strip=True) if q else "").strip()
-            a_text = (a.get_text(" ", strip=True) if a else "").strip()
-            if q_text and a_text and len(q_text) > 3:
-                faqs.append({"question": q_text, "answer": a_text})
-
-        # Fallback regex for inline Q:/A:
-        if not faqs:
-            text = get_text(soup)
-            pairs = re.findall(r"(?:^|\n|\r)(Q[:\)]?\s*)(.+?)(?:\n|\r)+(A[:\)]?\s*)(.+?)(?=\n|\r|$)", text, flags=re.I | re.S)
-            for _, q, __, a in pairs:
-                q = q.strip()
-                a = a.strip()
-                if q and a:
-                    faqs.append({"question": q, "answer": a})
-
-        return faqs[:50]
+        return _parse_faqs(fetch_text(url))
 
     # ---------- Socials & contact ----------
     @staticmethod
     def extract_socials_and_contact(base_url: str) -> Dict[str, Any]:
-        html, soup = fetch_html(base_url)
-        text = html + " " + get_text(soup)
-
-        # Socials via anchors (most reliable)
-        socials = {
-            "facebook": None, "instagram": None, "twitter": None, "tiktok": None,
-            "youtube": None, "linkedin": None, "pinterest": None
-        }
-        for a in soup.select("a[href]"):
-            href = a["href"]
-            if "facebook.com" in href:
-                socials["facebook"] = href
-            elif "instagram.com" in href:
-                socials["instagram"] = href
-            elif "twitter.com" in href or "x.com" in href:
-                socials["twitter"] = href
-            elif "tiktok.com" in href:
-                socials["tiktok"] = href
-            elif "youtube.com" in href or "youtu.be" in href:
-                socials["youtube"] = href
-            elif "linkedin.com" in href:
-                socials["linkedin"] = href
-            elif "pinterest." in href:
-                socials["pinterest"] = href
-
-        # Emails & phones via regex
-        emails = sorted(set(re.findall(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)))
-        phones = sorted(set(re.findall(r"(?:\+?\d[\d\s\-]{7,}\d)", text)))
+        info = _parse_socials_and_contact(fetch_text(base_url))
 
         # Address heuristics: try Contact page first
         contact_url = find_common_page(base_url, ["pages/contact", "pages/contact-us", "contact"])
-        address = None
-        if contact_url:
-            _, c_soup = fetch_html(contact_url)
-            # Try schema.org postal addresses
-            node = c_soup.select_one("[itemtype*='PostalAddress']")
-            if node:
-                address = get_text(node)
-            if not address:
-                # Try footer/company box
-                maybe = c_soup.select_one("address, .footer__content, .shopify-section--footer")
-                if maybe:
-                    address = get_text(maybe)
+        address = _parse_address(fetch_text(contact_url)) if contact_url else None
 
         return {
-            "emails": emails,
-            "phones": phones,
+            "emails": info["emails"],
+            "phones": info["phones"],
             "address": address,
-            "social_handles": {k: v for k, v in socials.items() if v}
+            "social_handles": info["social_handles"]
         }
 
     # ---------- Brand about / context ----------
     @staticmethod
-    def extract_about(base_url: str, home_soup: BeautifulSoup) -> str:
+    def extract_about(
+        base_url: str,
+        home_soup: Optional[BeautifulSoup] = None,
+        home_meta: Optional[Dict[str, Optional[str]]] = None,
+    ) -> str:
+        """
+        Text of the About page, falling back to the homepage meta description and
+        then its visible text. Pass an already parsed home_soup (a head-only soup
+        is fine) or home_meta (see home_meta) to reuse a fetch; with neither, only
+        the homepage <head> is fetched unless its visible text is needed.
+        """
         # Try About page
         about_url = find_common_page(base_url, ["pages/about", "pages/about-us", "pages/our-story"])
         if about_url:
-            _, soup = fetch_html(about_url)
-            return get_text(soup)[:4000]
+            return _parse_about(fetch_text(about_url))
 
         # Fallback to meta description or visible hero text
-        meta = home_soup.select_one("meta[name='description']")
-        if meta and meta.get("content"):
-            return meta["content"][:4000]
-
-        return get_text(home_soup)[:4000]
+        if home_soup is not None:
+            description = _meta_description(home_soup)
+            if description:
+                return description
+            if home_soup.body is not None:
+                return get_text(home_soup)[:4000]
+        else:
+            home_meta = home_meta or ShopifyScraper.home_meta(base_url)
+            if home_meta.get("description"):
+                return home_meta["description"]
+        return _parse_about(fetch_text(base_url))
 
     # ---------- Important links ----------
     @staticmethod
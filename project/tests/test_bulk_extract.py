@@ -0,0 +1,92 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+import bulk_extract
+from bulk_extract import Checkpoint, NDJSONSink, read_urls
+
+
+def test_checkpoint_recovers_from_torn_entry(tmp_path):
+    cp = Checkpoint(tmp_path / "out.checkpoint")
+    cp.record(["a.com"], 10)
+    with cp.path.open("a") as f:
+        f.write('{"urls": ["b.com"], "sta')  # crash mid-write
+
+    assert cp.load() == ({"a.com"}, 10)
+    cp.record(["c.com"], 30)
+    assert cp.load() == ({"a.com", "c.com"}, 30)
+
+
+def test_ndjson_resume_refuses_missing_or_short_output(tmp_path):
+    out = tmp_path / "out.ndjson"
+    with pytest.raises(SystemExit, match="--restart"):
+        NDJSONSink(out, 120)
+    out.write_bytes(b'{"a": 1}\n')
+    with pytest.raises(SystemExit, match="--restart"):
+        NDJSONSink(out, 120)
+    assert out.read_bytes() == b'{"a": 1}\n'
+
+    sink = NDJSONSink(out, 4)  # longer than the checkpoint: drop the uncommitted tail
+    sink.close()
+    assert out.read_bytes() == b'{"a"'
+
+
+def test_read_urls_accepts_lines_json_lines_and_arrays(tmp_path):
+    lines = tmp_path / "urls.txt"
+    lines.write_text('\ufeff{"website_url": "https://a.com"}\nb.com\n\nb.com\n', encoding="utf-8")
+    assert read_urls(lines) == ["https://a.com", "b.com"]
+    array = tmp_path / "urls.json"
+    array.write_text(json.dumps(["a.com", {"website_url": "c.com"}]))
+    assert read_urls(array) == ["a.com", "c.com"]
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    failing = {"boom.com"}
+
+    def extract(url):
+        if url in failing:
+            raise RuntimeError("timeout")
+        return {"status": "success", "website_url": url, "data": {
+            "products": {"catalog": [{"id": 1, "title": "T"}], "total_count": 1}}}
+
+    monkeypatch.setattr(bulk_extract, "extract_store", extract)
+    return failing
+
+
+def _run(tmp_path, urls):
+    out = tmp_path / "out.ndjson"
+    cp = Checkpoint(tmp_path / "out.ndjson.checkpoint")
+    done, state = cp.load()
+    sink = NDJSONSink(out, state)
+    errors = io.StringIO()
+    try:
+        stats = asyncio.run(bulk_extract.run(
+            [u for u in urls if u not in done], sink, cp, 2, 1, errors))
+    finally:
+        sink.close()
+    return stats, [json.loads(line) for line in out.read_text().splitlines()]
+
+
+def test_failed_stores_are_retried_on_resume(tmp_path, fake_store):
+    stats, records = _run(tmp_path, ["a.com", "boom.com"])
+    assert stats == {"success": 1, "error": 1}
+    assert [r["website_url"] for r in records] == ["a.com"]
+    assert records[0]["data"]["products"]["catalog"] == {
+        "id": [1], "title": ["T"], "handle": [None], "description": [None],
+        "price": [None], "images": [None], "product_url": [None]}
+
+    fake_store.clear()  # transient failure is over
+    stats, records = _run(tmp_path, ["a.com", "boom.com"])
+    assert stats == {"success": 1, "error": 0}
+    assert sorted(r["website_url"] for r in records) == ["a.com", "boom.com"]
+
+
+def test_resume_discards_output_written_after_last_checkpoint(tmp_path, fake_store):
+    _run(tmp_path, ["a.com"])
+    with (tmp_path / "out.ndjson").open("a") as f:
+        f.write('{"website_url": "half-writ')  # crash before the checkpoint
+    _, records = _run(tmp_path, ["a.com", "b.com"])
+    assert [r["website_url"] for r in records] == ["a.com", "b.com"]
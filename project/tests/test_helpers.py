@@ -0,0 +1,87 @@
+import httpx
+import pytest
+
+import utils.helpers as helpers
+from utils.helpers import fetch_text, find_common_page, stop_after_end_tag, stop_on_selector
+
+PAGE = (
+    "<html><head><title>Shop</title>\n<meta name='description' content='Hi'>\n</head>\n"
+    "<body><div class='hero'><a id='buy' href='/p'>Buy</a></div><footer>f</footer></body></html>"
+)
+
+
+def serve(monkeypatch, chunks, served=None, content_type="text/html; charset=utf-8"):
+    """Route get_client() to a transport streaming `chunks` (an iterable of bytes)."""
+
+    def body():
+        for chunk in chunks:
+            if served is not None:
+                served.append(len(chunk))
+            yield chunk
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": content_type}, content=body())
+
+    monkeypatch.setattr(helpers, "get_client", lambda: httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def in_chunks(text, size=7):
+    data = text.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_stops_after_head(monkeypatch):
+    served = []
+    serve(monkeypatch, in_chunks(PAGE), served)
+    html = fetch_text("https://shop.test", stop=[stop_after_end_tag("head")])
+    assert html == PAGE[:PAGE.index("</head>") + len("</head>")]
+    assert sum(served) < len(PAGE)
+
+
+def test_body_start_ends_an_unclosed_head(monkeypatch):
+    page = "<html><head><title>Shop</title><body><p>x</p></body></html>"
+    serve(monkeypatch, in_chunks(page))
+    assert fetch_text("https://shop.test", stop=[stop_after_end_tag("head")]) == "<html><head><title>Shop</title>"
+
+
+def test_stops_at_selector(monkeypatch):
+    serve(monkeypatch, in_chunks(PAGE))
+    html = fetch_text("https://shop.test", stop=[stop_on_selector("a#buy[href*='/p']")])
+    assert html == PAGE[:PAGE.index("Buy</a>")]
+
+
+def test_unsupported_selector_is_rejected():
+    with pytest.raises(ValueError):
+        stop_on_selector("div > a")
+
+
+def test_endless_body_is_capped(monkeypatch):
+    served = []
+
+    def endless():
+        while True:
+            yield b"<p>" + b"x" * 1000 + b"</p>"
+
+    serve(monkeypatch, endless(), served)
+    html = fetch_text("https://shop.test", max_bytes=10_000)
+    assert len(html.encode("utf-8")) == 10_000
+    assert sum(served) < 20_000
+
+
+def test_multibyte_characters_split_across_chunks(monkeypatch):
+    text = "<p>café ☃ \U0001F600</p>"
+    data = text.encode("utf-8")
+    serve(monkeypatch, [data[i:i + 1] for i in range(len(data))])
+    assert fetch_text("https://shop.test") == text
+
+
+def test_find_common_page_reads_only_a_prefix(monkeypatch):
+    served = []
+
+    def endless():
+        while True:
+            yield b"a" * 64
+
+    serve(monkeypatch, endless(), served)
+    assert find_common_page("https://shop.test", ["pages/about"]) == "https://shop.test/pages/about"
+    assert sum(served) <= 256
@@ -0,0 +1,197 @@
+import os
+import signal
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.queue_routes as queue_routes
+from services.extraction_worker import ExtractionWorker
+from services.job_queue import HTTPJobQueue, SQLiteJobQueue, get_job_queue, shard_for
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def queue(clock):
+    return SQLiteJobQueue(":memory:", num_shards=8, dead_after=30, max_attempts=2, clock=clock)
+
+
+def test_shard_is_stable_per_domain():
+    assert shard_for("a.com", 64) == shard_for("a.com", 64)
+    assert 0 <= shard_for("b.com", 8) < 8
+
+
+def test_domain_never_runs_twice_at_once(queue):
+    queue.enqueue_many(["a.com", "https://a.com/"])
+    first = queue.claim("w1")
+    assert first.domain == "a.com"
+    assert queue.claim("w1") is None  # same domain still running
+    queue.complete(first.id, "w1", {"ok": True})
+    assert queue.claim("w1").domain == "a.com"
+
+
+def test_shards_rebalance_to_new_worker(queue):
+    queue.heartbeat("w1")  # sole worker leases all 8 shards
+    queue.heartbeat("w2")
+    queue.heartbeat("w1")  # w1 hands back its surplus
+    queue.heartbeat("w2")
+    owners = [r["owner"] for r in queue._conn.execute("SELECT owner FROM shards")]
+    assert owners.count("w1") == 4 and owners.count("w2") == 4
+
+
+def test_job_of_each_shard_only_goes_to_its_owner(queue):
+    queue.heartbeat("w1")
+    queue.heartbeat("w2")
+    queue.heartbeat("w1")
+    queue.heartbeat("w2")
+    job_id = queue.enqueue("a.com")
+    owner = queue._conn.execute(
+        "SELECT owner FROM shards WHERE shard = ?", (shard_for("a.com", 8),)
+    ).fetchone()["owner"]
+    other = "w2" if owner == "w1" else "w1"
+    assert queue.claim(other) is None
+    assert queue.claim(owner).id == job_id
+
+
+def test_dead_worker_jobs_are_reassigned(queue, clock):
+    job_id = queue.enqueue("a.com")
+    assert queue.claim("w1").id == job_id
+
+    clock.now += 10
+    queue.heartbeat("w2")
+    assert queue.reap_dead_workers() == 0
+
+    clock.now += 25  # w1 silent for 35s > dead_after
+    queue.heartbeat("w2")
+    assert queue.reap_dead_workers() == 1
+
+    job = queue.claim("w2")
+    assert job.id == job_id and job.attempts == 2
+    # The presumed-dead worker finishing late must not overwrite the new lease
+    assert queue.complete(job_id, "w1", {"from": "w1"}) is False
+    assert queue.complete(job_id, "w2", {"from": "w2"}) is True
+    assert queue.result(job_id) == {"from": "w2"}
+
+
+def test_lost_job_fails_after_max_attempts(queue, clock):
+    job_id = queue.enqueue("a.com")
+    for worker in ("w1", "w2"):
+        assert queue.claim(worker).id == job_id
+        clock.now += 60
+        queue.reap_dead_workers()
+    assert queue.counts() == {"failed": 1}
+
+
+def test_fail_retries_then_gives_up(queue):
+    job_id = queue.enqueue("a.com")
+    queue.claim("w1")
+    assert queue.fail(job_id, "w1", "boom")
+    assert queue.counts() == {"pending": 1}
+    queue.claim("w1")
+    queue.fail(job_id, "w1", "boom")
+    assert queue.counts() == {"failed": 1}
+
+
+def test_worker_runs_jobs_and_records_failures(queue):
+    queue.enqueue_many(["a.com", "b.com", "boom.com"])
+
+    def crawl(url):
+        if url == "boom.com":
+            raise RuntimeError("unreachable")
+        return {"url": url}
+
+    worker = ExtractionWorker(queue, worker_id="w1", crawl=crawl)
+    while worker.run_once():
+        pass
+    assert queue.counts() == {"done": 2, "failed": 1}
+
+
+def test_interrupted_worker_finishes_its_job_before_unregistering(queue):
+    job_id = queue.enqueue("a.com")
+    started, release = threading.Event(), threading.Event()
+
+    def crawl(url):
+        started.set()
+        release.wait(5)
+        return {"url": url}
+
+    def interrupt():
+        started.wait(5)
+        os.kill(os.getpid(), signal.SIGINT)  # Ctrl-C while run() is joining
+        time.sleep(0.05)
+        release.set()
+
+    worker = ExtractionWorker(queue, worker_id="w1", crawl=crawl, heartbeat_seconds=0.01, poll_seconds=0.01)
+    threading.Thread(target=interrupt).start()
+    with pytest.raises(KeyboardInterrupt):
+        worker.run()
+
+    assert queue.counts() == {"done": 1}
+    assert queue.result(job_id) == {"url": "a.com"}
+    assert queue._conn.execute("SELECT COUNT(*) FROM workers").fetchone()[0] == 0
+
+
+@pytest.fixture
+def http_queue(queue, monkeypatch):
+    """HTTPJobQueue talking to the /api/queue routes, backed by `queue`."""
+    monkeypatch.setattr(queue_routes.settings, "QUEUE_TOKEN", "secret")
+    app = FastAPI()
+    app.include_router(queue_routes.router, prefix="/api/queue")
+    app.dependency_overrides[get_job_queue] = lambda: queue
+    client = TestClient(app, base_url="http://coordinator/api/queue")
+    return lambda token="secret": HTTPJobQueue("http://coordinator/api/queue", token=token, client=client)
+
+
+def test_remote_workers_share_the_coordinator_queue(queue, http_queue, clock):
+    producer, node_a, node_b = http_queue(), http_queue(), http_queue()
+    ids = producer.enqueue_many(["a.com", "b.com"])
+
+    node_a.heartbeat("a")
+    node_b.heartbeat("b")
+    node_a.heartbeat("a")  # both nodes now hold half the shards
+    jobs = [node.claim(w) for node, w in ((node_a, "a"), (node_b, "b"), (node_a, "a"), (node_b, "b"))]
+    claimed = {job.id: w for job, w in zip(jobs, "abab") if job}
+    assert sorted(claimed) == sorted(ids)
+
+    for job_id, worker in claimed.items():
+        node = node_a if worker == "a" else node_b
+        assert node.complete(job_id, worker, {"at": clock.now}) is True
+        assert node.complete(job_id, worker, {}) is False  # no longer held
+    assert producer.counts() == {"done": 2}
+    assert producer.result(ids[0]) == {"at": clock.now}
+
+
+def test_remote_worker_runs_jobs(http_queue):
+    node = http_queue()
+    node.enqueue_many(["a.com", "boom.com"])
+
+    def crawl(url):
+        if url == "boom.com":
+            raise RuntimeError("unreachable")
+        return {"url": url}
+
+    worker = ExtractionWorker(node, worker_id="remote", crawl=crawl)
+    while worker.run_once():
+        pass
+    assert node.counts() == {"done": 1, "failed": 1}
+
+
+def test_queue_endpoints_require_token(http_queue):
+    with pytest.raises(httpx.HTTPStatusError) as e:
+        http_queue(token="wrong").enqueue("a.com")
+    assert e.value.response.status_code == 401
@@ -0,0 +1,24 @@
+from sqlalchemy import create_engine, inspect
+
+from migrate_db import migrate
+
+
+def test_adds_recrawl_columns_to_existing_brands_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # brands table as created before the recrawl scheduler existed
+        conn.exec_driver_sql(
+            "CREATE TABLE brands (id INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL,"
+            " website_url VARCHAR(255) NOT NULL UNIQUE, created_at TIMESTAMP, updated_at TIMESTAMP)"
+        )
+        conn.exec_driver_sql("INSERT INTO brands (name, website_url) VALUES ('A', 'https://a.com')")
+
+    migrate(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("brands")}
+    assert {"next_crawl_at", "crawl_count", "catalog_change_count", "last_request_cost"} <= columns
+    with engine.connect() as conn:
+        row = conn.exec_driver_sql("SELECT crawl_count, next_crawl_at FROM brands").one()
+    assert tuple(row) == (0, None)
+    assert inspect(engine).has_table("products")
+    assert migrate(engine) == []  # idempotent
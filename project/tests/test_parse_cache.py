@@ -0,0 +1,52 @@
+import pytest
+
+import utils.parse_cache as parse_cache
+from utils.parse_cache import ParseCache, memoize_parse
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    store = ParseCache(tmp_path / "cache.sqlite3", max_entries=100, hot_entries=2, touch_batch=3)
+    monkeypatch.setattr(parse_cache, "_cache", store)
+    monkeypatch.setattr(parse_cache, "PARSE_CACHE_MAX_ENTRIES", 100)
+    return store
+
+
+def test_unchanged_body_skips_the_extractor(cache):
+    calls = []
+
+    @memoize_parse("demo", 1)
+    def extract(html, base_url):
+        calls.append(html)
+        return {"len": len(html), "base": base_url}
+
+    assert extract("<p>a</p>", "https://a.com") == {"len": 8, "base": "https://a.com"}
+    assert extract("<p>a</p>", "https://a.com") == {"len": 8, "base": "https://a.com"}
+    assert extract("<p>b</p>", "https://a.com")["len"] == 8
+    assert extract("<p>a</p>", "https://b.com")["base"] == "https://b.com"
+    assert len(calls) == 3
+
+
+def test_hits_do_not_write_until_batch_is_full(cache):
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    writes = cache._conn.total_changes
+    assert cache.get("a") == "a"
+    assert cache.get("b") == "b"
+    assert cache.get("b") == "b"
+    assert cache._conn.total_changes == writes
+    cache.get("c")  # third distinct key fills the batch
+    assert cache._conn.total_changes == writes + 3
+
+
+def test_cached_values_cannot_be_mutated_by_callers(cache):
+    cache.put("k", {"a": [1]})
+    cache.get("k")["a"].append(2)
+    assert cache.get("k") == {"a": [1]}
+
+
+def test_falls_back_to_store_after_leaving_memory(cache):
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    assert "a" not in cache._hot
+    assert cache.get("a") == "a"
@@ -0,0 +1,132 @@
+import math
+import random
+import statistics
+from datetime import datetime, timedelta
+
+from models.db_models import Brand
+from services.recrawl_scheduler import RecrawlScheduler, RequestBudget, fingerprint
+
+NOW = datetime(2026, 1, 1)
+
+
+def _result(catalog=(), heroes=(), faqs=()):
+    return {"data": {
+        "products": {"catalog": list(catalog), "hero_products": list(heroes), "total_count": len(catalog)},
+        "faqs": list(faqs),
+    }}
+
+
+def _scheduler():
+    return RecrawlScheduler(crawl=lambda url: {}, session_factory=lambda: None,
+                            min_interval=3600, max_interval=7 * 86400, default_interval=86400)
+
+
+def _crawl_n(scheduler, brand, results):
+    now = NOW
+    for r in results:
+        scheduler.record_crawl(brand, r, now)
+        now = brand.next_crawl_at
+    return brand
+
+
+def test_fingerprint_splits_catalog_from_page_content():
+    base = fingerprint(_result(catalog=[{"id": 1}]))
+    assert fingerprint(_result(catalog=[{"id": 2}]))[1] == base[1]
+    hero_change = fingerprint(_result(catalog=[{"id": 1}], heroes=[{"handle": "x"}]))
+    assert hero_change[0] == base[0] and hero_change[1] != base[1]
+
+
+def test_interval_tracks_change_rate():
+    s = _scheduler()
+    changing = _crawl_n(s, Brand(), [_result(catalog=[{"id": i}]) for i in range(6)])
+    static = _crawl_n(s, Brand(), [_result(catalog=[{"id": 1}])] * 6)
+    assert changing.catalog_change_count == 5 and static.catalog_change_count == 0
+    assert changing.crawl_interval_seconds < 86400 < static.crawl_interval_seconds
+
+
+def _simulate(scheduler, rate, crawls, seed=0):
+    """Crawl a store whose changes arrive at rate(i) per second; return the intervals."""
+    rng = random.Random(seed)
+    brand, now, version, intervals = Brand(), NOW, 0, []
+    for i in range(crawls):
+        scheduler.record_crawl(brand, _result(catalog=[{"id": version}]), now)
+        interval = brand.crawl_interval_seconds
+        intervals.append(interval)
+        if rng.random() < 1 - math.exp(-rate(i) * interval):
+            version += 1
+        now += timedelta(seconds=interval)
+    return intervals
+
+
+def test_interval_settles_for_steady_change_rate():
+    s = _scheduler()
+    target = 25 * 3600  # a crawl every 25h finds a change half the time
+    settled = _simulate(s, lambda i: math.log(2) / target, 400)[100:]
+    assert 0.8 * target < statistics.median(settled) < 1.25 * target
+    deciles = statistics.quantiles(settled, n=10)
+    assert deciles[0] > 0.4 * target and deciles[-1] < 2.5 * target
+
+
+def test_interval_adapts_when_store_starts_changing():
+    s = _scheduler()
+    intervals = _simulate(s, lambda i: 0.0 if i < 60 else 1.0, 100)
+    assert intervals[59] == s.max_interval
+    assert intervals[66] < s.max_interval
+    assert intervals[99] == s.min_interval
+
+
+def test_failures_back_off_until_a_crawl_succeeds():
+    s = _scheduler()
+    brand = Brand()
+    delays = []
+    for _ in range(10):
+        s.record_failure(brand, NOW)
+        delays.append((brand.next_crawl_at - NOW).total_seconds())
+    assert delays[:4] == [3600, 7200, 14400, 28800]
+    assert delays[-1] == s.max_interval
+
+    s.record_crawl(brand, _result(), NOW)
+    s.record_failure(brand, NOW)
+    assert (brand.next_crawl_at - NOW).total_seconds() == 3600
+
+
+def test_budget_is_a_sliding_hour_window():
+    t = [0.0]
+    budget = RequestBudget(100, clock=lambda: t[0])
+    assert budget.try_acquire(60)
+    assert not budget.try_acquire(60)
+    assert budget.try_acquire(40)
+    t[0] = 3600
+    assert budget.try_acquire(100)
+
+
+class _Session:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_oversized_brand_does_not_starve_later_brands():
+    crawled = []
+
+    class Scheduler(RecrawlScheduler):
+        def due_brands(self, session, now, limit):
+            return brands
+
+    brands = [
+        Brand(website_url="https://huge.com", last_request_cost=10 ** 6),
+        Brand(website_url="https://a.com", last_request_cost=45),
+        Brand(website_url="https://b.com", last_request_cost=45),
+    ]
+    s = Scheduler(crawl=lambda url: crawled.append(url) or _result(),
+                  session_factory=_Session, requests_per_hour=100)
+    s.budget.try_acquire(10)  # window already partly used
+
+    stats = s.run_due(NOW)
+    assert stats == {"crawled": 2, "failed": 0, "deferred": 1}
+    assert sorted(crawled) == ["https://a.com", "https://b.com"]
@@ -0,0 +1,43 @@
+from services.search_index import ProductSearchIndex, to_match_query
+
+
+def _product(pid, title, price, description=""):
+    return {"id": pid, "title": title, "handle": f"p-{pid}", "price": price,
+            "description": description, "product_url": f"https://a.com/products/p-{pid}"}
+
+
+def test_index_is_incremental_and_drops_removed_products(tmp_path):
+    ix = ProductSearchIndex(tmp_path / "ix.sqlite3")
+    catalog = [_product(1, "Blue Shirt", "20"), _product(2, "Red Dress", "50")]
+    assert ix.index_products("https://a.com", "A", catalog)["added"] == 2
+
+    catalog[1]["price"] = "45"
+    stats = ix.index_products("a.com", "A", catalog[1:])
+    assert stats == {"added": 0, "updated": 1, "removed": 1, "unchanged": 0}
+    assert ix.search("shirt") == []
+
+
+def test_truncated_or_empty_catalog_keeps_indexed_products(tmp_path):
+    ix = ProductSearchIndex(tmp_path / "ix.sqlite3")
+    ix.index_products("a.com", "A", [_product(1, "Blue Shirt", "20"), _product(2, "Red Dress", "50")])
+
+    assert ix.index_products("a.com", "A", [])["removed"] == 0
+    stats = ix.index_products("a.com", "A", [_product(1, "Blue Shirt", "25")], complete=False)
+    assert stats == {"added": 0, "updated": 1, "removed": 0, "unchanged": 0}
+    assert [h["id"] for h in ix.search("dress")] == ["2"]
+
+
+def test_search_ranks_and_filters_by_price(tmp_path):
+    ix = ProductSearchIndex(tmp_path / "ix.sqlite3")
+    ix.index_products("a.com", "A", [
+        _product(1, "Cotton Shirt", "20"),
+        _product(2, "Linen Dress", "80", "<p>Soft <b>cotton</b> blend</p>"),
+    ])
+    hits = ix.search("cotton")
+    assert [h["id"] for h in hits] == ["1", "2"]  # title outranks description
+    assert [h["id"] for h in ix.search("cott", min_price=50)] == ["2"]
+
+
+def test_match_query_neutralises_fts_syntax():
+    assert to_match_query('shirt OR "x') == '"shirt" "OR" "x"*'
+    assert to_match_query("!!") is None
@@ -0,0 +1,21 @@
+import services.web_scraper as web_scraper
+from services.web_scraper import ShopifyScraper
+
+
+def _serve_pages(monkeypatch, pages):
+    """pages[i] is the products.json payload for page i + 1 (None for a failed request)."""
+    def fetch_json(url):
+        page = int(url.rsplit("page=", 1)[1])
+        return pages[page - 1] if page <= len(pages) else {"products": []}
+    monkeypatch.setattr(web_scraper, "fetch_json", fetch_json)
+
+
+def test_catalog_reports_whether_paging_finished(monkeypatch):
+    _serve_pages(monkeypatch, [{"products": [{"id": 1, "handle": "a"}]}])
+    catalog, complete = ShopifyScraper.fetch_catalog("https://a.com")
+    assert [p["id"] for p in catalog] == [1] and complete
+
+    _serve_pages(monkeypatch, [{"products": [{"id": 1, "handle": "a"}]}, None])  # e.g. a 429 on page 2
+    catalog, complete = ShopifyScraper.fetch_catalog("https://a.com")
+    assert [p["id"] for p in catalog] == [1] and not complete
+    assert ShopifyScraper.fetch_all_products("https://a.com") == catalog
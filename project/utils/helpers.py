@@ -1,7 +1,11 @@
 from __future__ import annotations
+import codecs
+import hashlib
 import json
 import re
 import urllib.parse
+from html import unescape
+from html.parser import HTMLParser
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -34,6 +38,8 @@ else:
 
 DEFAULT_HEADERS: Dict[str, str] = CONFIG.get("DEFAULT_HEADERS", {})
 REQUEST_TIMEOUT: float = CONFIG.get("REQUEST_TIMEOUT", 20.0)
+# Hard cap on any HTML body we download; larger pages are truncated
+MAX_BODY_BYTES: int = CONFIG.get("MAX_BODY_BYTES", 5 * 1024 * 1024)
 
 # -----------------------------
 # HTTP Client
@@ -60,16 +66,190 @@ def join_url(base: str, path: str) -> str:
     """Join base URL with relative path."""
     return urllib.parse.urljoin(base.rstrip("/") + "/", path.lstrip("/"))
 
+def store_domain(website_url: str) -> str:
+    """Lower-cased host of a store URL (scheme optional), e.g. "memy.co.in"."""
+    url = website_url if "://" in website_url else "https://" + website_url
+    return urllib.parse.urlparse(url).netloc.lower()
+
+# -----------------------------
+# Streaming Stop Conditions
+# -----------------------------
+class StopCondition:
+    """Decides, from tags seen by the incremental parser, when a streamed read can end."""
+
+    # Whether a matching start tag is itself excluded from the returned text
+    cut_before_start = False
+
+    def on_start(self, tag: str, attrs: Dict[str, str]) -> bool:
+        return False
+
+    def on_end(self, tag: str) -> bool:
+        return False
+
+class _AfterEndTag(StopCondition):
+    cut_before_start = True
+
+    def __init__(self, tag: str):
+        self.tag = tag.lower()
+
+    def on_start(self, tag: str, attrs: Dict[str, str]) -> bool:
+        # <body> implies the head is over even if </head> was omitted
+        return self.tag == "head" and tag == "body"
+
+    def on_end(self, tag: str) -> bool:
+        return tag == self.tag
+
+_SIMPLE_SELECTOR = re.compile(
+    r"(?P<tag>^[a-zA-Z][\w-]*)|\#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)"
+    r"|\[(?P<attr>[\w:-]+)(?:(?P<op>\*?=)['\"]?(?P<val>[^'\"\]]*)['\"]?)?\]"
+)
+
+class _SelectorFound(StopCondition):
+    """Matches a single compound selector: tag, #id, .class, [attr], [attr=v], [attr*=v]."""
+
+    def __init__(self, selector: str):
+        self.tag: Optional[str] = None
+        self.checks: List[Tuple[str, Optional[str], Optional[str]]] = []
+        pos = 0
+        for m in _SIMPLE_SELECTOR.finditer(selector.strip()):
+            if m.start() != pos:
+                break
+            pos = m.end()
+            if m.group("tag"):
+                self.tag = m.group("tag").lower()
+            elif m.group("id"):
+                self.checks.append(("id", "=", m.group("id")))
+            elif m.group("cls"):
+                self.checks.append(("class", "~=", m.group("cls")))
+            else:
+                self.checks.append((m.group("attr").lower(), m.group("op"), m.group("val")))
+        if pos != len(selector.strip()):
+            raise ValueError(f"Unsupported streaming selector: {selector!r}")
+
+    def on_start(self, tag: str, attrs: Dict[str, str]) -> bool:
+        if self.tag and tag != self.tag:
+            return False
+        for name, op, val in self.checks:
+            have = attrs.get(name)
+            if have is None:
+                return False
+            if op == "=" and have != val:
+                return False
+            if op == "*=" and val not in have:
+                return False
+            if op == "~=" and val not in have.split():
+                return False
+        return True
+
+def stop_after_end_tag(tag: str) -> StopCondition:
+    """Stop once </tag> has been read (e.g. "head")."""
+    return _AfterEndTag(tag)
+
+def stop_on_selector(selector: str) -> StopCondition:
+    """Stop once an element matching a simple selector (no combinators) has started."""
+    return _SelectorFound(selector)
+
+class _StreamWatcher(HTMLParser):
+    """Incremental parser used only to evaluate stop conditions while streaming."""
+
+    def __init__(self, conditions: List[StopCondition]):
+        super().__init__(convert_charrefs=False)
+        self.conditions = conditions
+        self.stopped = False
+        # Absolute offset where the returned text should end (once stopped);
+        # for end tags it points at "</" and the tag itself is kept
+        self.cut = 0
+        self.cut_through_tag = False
+        self._fed = 0
+        self._line_starts = [0]
+
+    def feed(self, data: str) -> None:
+        self._line_starts.extend(self._fed + m.end() for m in re.finditer("\n", data))
+        self._fed += len(data)
+        super().feed(data)
+
+    def _tag_offset(self) -> int:
+        # getpos() points at the start of the tag being handled
+        line, col = self.getpos()
+        return self._line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        if self.stopped:
+            return
+        attr_map = {k.lower(): (v or "") for k, v in attrs}
+        for c in self.conditions:
+            if c.on_start(tag, attr_map):
+                start = self._tag_offset()
+                text = self.get_starttag_text() or ""
+                self.cut = start if c.cut_before_start else start + len(text)
+                self.stopped = True
+                return
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if not self.stopped and any(c.on_end(tag) for c in self.conditions):
+            self.cut = self._tag_offset()
+            self.cut_through_tag = True
+            self.stopped = True
+
 # -----------------------------
 # Fetch Helpers
 # -----------------------------
-def fetch_html(url: str) -> Tuple[str, BeautifulSoup]:
-    """Fetch HTML page and return (text, soup)."""
+def read_stream(
+    r: httpx.Response,
+    max_bytes: int = MAX_BODY_BYTES,
+    stop: Optional[List[StopCondition]] = None,
+    min_chars: Optional[int] = None,
+) -> str:
+    """
+    Read a streamed response incrementally and return the text read so far.
+    Stops at max_bytes, once any stop condition matches (the body is fed to
+    an incremental HTML parser), or once min_chars characters were decoded.
+    """
+    decoder = codecs.getincrementaldecoder(r.encoding or "utf-8")(errors="replace")
+    watcher = _StreamWatcher(stop) if stop else None
+    parts: List[str] = []
+    size = chars = 0
+    for chunk in r.iter_bytes():
+        chunk = chunk[:max_bytes - size]
+        size += len(chunk)
+        text = decoder.decode(chunk)
+        parts.append(text)
+        chars += len(text)
+        if watcher is not None:
+            watcher.feed(text)
+            if watcher.stopped:
+                html = "".join(parts)
+                if watcher.cut_through_tag:
+                    return html[:html.find(">", watcher.cut) + 1]
+                return html[:watcher.cut]
+        if size >= max_bytes or (min_chars is not None and chars >= min_chars):
+            break
+    else:
+        parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+def fetch_text(
+    url: str,
+    max_bytes: int = MAX_BODY_BYTES,
+    stop: Optional[List[StopCondition]] = None,
+) -> str:
+    """Fetch a page body (size-capped, optionally stopping early) without parsing it."""
     with get_client() as client:
-        r = client.get(url)
-        r.raise_for_status()
-        html = r.text
-        return html, BeautifulSoup(html, "html.parser")
+        with client.stream("GET", url) as r:
+            r.raise_for_status()
+            return read_stream(r, max_bytes, stop)
+
+def fetch_html(
+    url: str,
+    max_bytes: int = MAX_BODY_BYTES,
+    stop: Optional[List[StopCondition]] = None,
+) -> Tuple[str, BeautifulSoup]:
+    """Fetch HTML page and return (text, soup). See fetch_text for max_bytes/stop."""
+    html = fetch_text(url, max_bytes, stop)
+    return html, BeautifulSoup(html, "html.parser")
 
 def fetch_json(url: str) -> Optional[Dict[str, Any]]:
     """Fetch JSON from a URL if possible."""
@@ -82,6 +262,10 @@ def fetch_json(url: str) -> Optional[Dict[str, Any]]:
         except Exception:
             return None
 
+def content_hash(text: str) -> str:
+    """Stable hash of a fetched body, used to key parsed results."""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
 # -----------------------------
 # Parsing Helpers
 # -----------------------------
@@ -92,15 +276,22 @@ def get_text(soup: BeautifulSoup) -> str:
     text = soup.get_text(" ", strip=True)
     return re.sub(r"\s+", " ", text).strip()
 
+def strip_html(html: str) -> str:
+    """Cheap tag strip for product descriptions (no full parse)."""
+    text = re.sub(r"<(script|style)[^>]*>.*?</\1>", " ", html, flags=re.I | re.S)
+    text = unescape(re.sub(r"<[^>]+>", " ", text))
+    return re.sub(r"\s+", " ", text).strip()
+
 def find_common_page(base_url: str, candidates: List[str]) -> Optional[str]:
     """Check common Shopify paths like /policies/privacy-policy, /faq, etc."""
     with get_client() as client:
         for path in candidates:
             url = join_url(base_url, path)
             try:
-                r = client.get(url)
-                if r.status_code == 200 and len(r.text) > 200:
-                    return url
+                # Only the first 200+ characters matter, don't download the page
+                with client.stream("GET", url) as r:
+                    if r.status_code == 200 and len(read_stream(r, min_chars=201)) > 200:
+                        return url
             except Exception:
                 continue
     return None
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.helpers import CONFIG, content_hash
+
+# -----------------------------
+# Config
+# -----------------------------
+PARSE_CACHE_PATH = Path(
+    CONFIG.get(
+        "PARSE_CACHE_PATH",
+        Path(__file__).resolve().parent.parent / ".cache" / "parse_cache.sqlite3"
+    )
+)
+# 0 disables memoization entirely
+PARSE_CACHE_MAX_ENTRIES: int = CONFIG.get("PARSE_CACHE_MAX_ENTRIES", 50000)
+
+_MISS = object()
+
+
+# -----------------------------
+# Store
+# -----------------------------
+class ParseCache:
+    """
+    Bounded SQLite store of extractor outputs keyed by
+    (content hash, extractor name, extractor version, extra args).
+    Least recently used entries are evicted once max_entries is exceeded.
+
+    A small in-memory LRU sits in front of the store, and last_used updates
+    for hits are batched, so the hit path never writes to disk.
+    """
+
+    def __init__(self, path: Path, max_entries: int, hot_entries: int = 2048, touch_batch: int = 256):
+        self.max_entries = max_entries
+        self.hot_entries = min(hot_entries, max_entries)
+        self.touch_batch = touch_batch
+        self._lock = threading.Lock()
+        self._puts = 0
+        # key -> JSON payload (decoded per hit so callers can't mutate cached values)
+        self._hot: "OrderedDict[str, str]" = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parsed ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS parsed_last_used ON parsed(last_used)")
+        self._conn.commit()
+
+    def _remember(self, key: str, payload: str) -> None:
+        self._hot[key] = payload
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_entries:
+            self._hot.popitem(last=False)
+
+    def _flush_touches(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE parsed SET last_used = ? WHERE key = ?",
+                [(ts, key) for key, ts in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            payload = self._hot.get(key)
+            if payload is None:
+                row = self._conn.execute("SELECT value FROM parsed WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return _MISS
+                payload = row[0]
+            self._remember(key, payload)
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touches()
+                self._conn.commit()
+        return json.loads(payload)
+
+    def put(self, key: str, value: Any) -> None:
+        payload = json.dumps(value)
+        with self._lock:
+            self._remember(key, payload)
+            self._flush_touches()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed (key, value, last_used) VALUES (?, ?, ?)",
+                (key, payload, time.time())
+            )
+            self._puts += 1
+            # Amortize eviction: only trim once every 1% of capacity
+            if self._puts >= max(1, self.max_entries // 100):
+                self._puts = 0
+                self._conn.execute(
+                    "DELETE FROM parsed WHERE key IN ("
+                    " SELECT key FROM parsed ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """Persist pending last_used updates."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hot.clear()
+            self._touched.clear()
+            self._conn.execute("DELETE FROM parsed")
+            self._conn.commit()
+
+
+_cache: Optional[ParseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """Return the shared parse cache, or None when memoization is disabled."""
+    global _cache
+    if PARSE_CACHE_MAX_ENTRIES <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ParseCache(PARSE_CACHE_PATH, PARSE_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def cache_key(name: str, version: int, body_hash: str, args: Tuple[Any, ...]) -> str:
+    raw = json.dumps([name, version, body_hash, list(args)], default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# Decorator
+# -----------------------------
+def memoize_parse(name: str, version: int) -> Callable:
+    """
+    Memoize an extractor of the form fn(html, *args) on the hash of html.
+    Bump `version` whenever the extractor's output changes for the same input.
+    Results must be JSON-serializable.
+    """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(html: str, *args: Any) -> Any:
+            cache = get_parse_cache()
+            if cache is None:
+                return fn(html, *args)
+            key = cache_key(name, version, content_hash(html), args)
+            try:
+                value = cache.get(key)
+            except sqlite3.Error:
+                return fn(html, *args)
+            if value is not _MISS:
+                return value
+            value = fn(html, *args)
+            try:
+                cache.put(key, value)
+            except sqlite3.Error:
+                pass
+            return value
+        return wrapper
+    return decorator